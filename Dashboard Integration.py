@@ -2,9 +2,20 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-import plotly.io as pio
-import zipfile
+import os
+import uuid
+
+from salesdash.charts import encode_figure
+from salesdash.downsample import downsample
+from salesdash.export import export_zip
+from salesdash.forecast import ForecastCache, forecast_series
+from salesdash.index import COMPARISON_MODES, period_delta
+from salesdash.precompute import TabScheduler
+from salesdash.profiler import RerunProfile, render_panel
+from salesdash.results import ResultCache, filter_key, selection
+from salesdash.sources import open_source, source_spec
+from salesdash.stats import plotly_box, summarize
+from salesdash.timeseries import GRANULARITIES, UNITS, WINDOWS
 
 # -----------------------------
 # PAGE CONFIG
@@ -18,124 +29,252 @@ st.set_page_config(
 st.title("🚀 Advanced Interactive Sales Dashboard")
 st.markdown("Analyze your sales, track performance, and forecast future trends in one place.")
 
+# Stage timings for this rerun; logged and exported by profile.finish() below
+profile = RerunProfile("dashboard")
+
 # -----------------------------
 # LOAD DATA
 # -----------------------------
-df = pd.read_excel("Product-Sales-Region.xlsx")
-df.columns = df.columns.str.strip()
-df["Date"] = pd.to_datetime(df["Date"])
-df["Month"] = df["Date"].dt.to_period("M").astype(str)
+# Workbook, Parquet dataset or SQL database; override with $SALES_SOURCE
+data_source = source_spec("Product-Sales-Region.xlsx")
+
+
+@st.cache_resource
+def build_source(spec):
+    return open_source(spec)
+
+
+@st.cache_resource
+def forecast_cache():
+    return ForecastCache()
+
+
+# One source per process, shared by every session; filters and group-bys run
+# inside it (in memory, in Arrow or in SQL) and only aggregates come back.
+source = build_source(data_source)
 
 # -----------------------------
 # SIDEBAR FILTERS
 # -----------------------------
 st.sidebar.header("Filters 🔎")
+with profile.stage("load", cache=source):
+    region_options = source.categories("Region")
+    product_options = source.categories("Product")
+    date_bounds = list(source.date_bounds())
 
-region_filter = st.sidebar.multiselect("Select Region", df["Region"].unique(), df["Region"].unique())
-product_filter = st.sidebar.multiselect("Select Product", df["Product"].unique(), df["Product"].unique())
-start_date, end_date = st.sidebar.date_input("Select Date Range", [df["Date"].min(), df["Date"].max()])
+region_filter = st.sidebar.multiselect("Select Region", region_options, region_options)
+product_filter = st.sidebar.multiselect("Select Product", product_options, product_options)
+start_date, end_date = st.sidebar.date_input("Select Date Range", date_bounds)
+comparison = st.sidebar.selectbox("Compare Sales Against", list(COMPARISON_MODES), format_func=COMPARISON_MODES.get)
+show_profile = st.sidebar.checkbox("⏱ Show stage timings", value=False)
 
-filtered_df = df[
-    (df["Region"].isin(region_filter)) &
-    (df["Product"].isin(product_filter)) &
-    (df["Date"] >= pd.to_datetime(start_date)) &
-    (df["Date"] <= pd.to_datetime(end_date))
-]
+filters = (region_filter, product_filter, start_date, end_date)
 
 # -----------------------------
 # KPI METRICS
 # -----------------------------
-total_sales = filtered_df["TotalPrice"].sum()
-total_orders = filtered_df["OrderID"].nunique()
-avg_discount = filtered_df["Discount"].mean()
+with profile.stage("kpis", cache=source):
+    kpis = source.kpis(*filters)
+    total_sales = kpis["total_sales"]
+    total_orders = kpis["total_orders"]
+    avg_discount = kpis["avg_discount"]
 
-# Optional: calculate delta for KPIs
-prev_df = df[
-    (df["Region"].isin(region_filter)) &
-    (df["Product"].isin(product_filter)) &
-    (df["Date"] < pd.to_datetime(start_date))
-]
-prev_sales = prev_df["TotalPrice"].sum() if not prev_df.empty else 0
-sales_delta = ((total_sales - prev_sales) / prev_sales * 100) if prev_sales != 0 else 0
+    # Optional: calculate delta for KPIs
+    sales_delta = period_delta(source, region_filter, product_filter, start_date, end_date, comparison)
 
 col1, col2, col3 = st.columns(3)
-col1.metric("💰 Total Sales", f"₹{total_sales:,.0f}", f"{sales_delta:+.2f}% vs previous period")
+col1.metric("💰 Total Sales", f"₹{total_sales:,.0f}", f"{sales_delta:+.2f}% vs {COMPARISON_MODES[comparison]}")
 col2.metric("🧾 Total Orders", total_orders)
 col3.metric("🏷 Avg Discount", f"{avg_discount:.2f}")
 
+# -----------------------------
+# TAB COMPUTATIONS
+# -----------------------------
+# These run on the scheduler's worker threads, so they must not call st.*
+# Figures are encoded as typed arrays, so their payload is binary, not decimal text.
+METRICS = ["TotalPrice", "Quantity", "Discount"]
+
+
+def trend_tab(source, filters, freq, windows):
+    # Gap-filled periods with rolling means, from the source's per-series daily sums
+    trend_df = source.trend("TotalPrice", *filters, freq=freq, windows=windows).reset_index()
+    # Rolling averages use every period; only the plotted points are thinned out.
+    sales_points = downsample(trend_df, "Date", "TotalPrice", method="minmax")
+    trend_fig = px.line(sales_points, x="Date", y="TotalPrice", title=f"{GRANULARITIES[freq]} Sales", markers=True,
+                        template="plotly_dark")
+    for w in windows:
+        avg_points = downsample(trend_df, "Date", f"Rolling_{w}")
+        trend_fig.add_scatter(x=avg_points["Date"], y=avg_points[f"Rolling_{w}"], mode="lines",
+                              name=f"{w}-{UNITS[freq]} Avg", line=dict(dash="dash"))
+    return trend_df, encode_figure(trend_fig)
+
+
+def region_tab(source, filters, metric):
+    region_totals = source.by_region(metric, *filters).reset_index()
+    bar_fig = px.bar(region_totals, x="Region", y=metric, color="Region",
+                     title=f"{metric} by Region", template="plotly_dark")
+    return region_totals, encode_figure(bar_fig)
+
+
+def box_tab(source, filters):
+    # Quartiles, fences and outliers per product instead of every row
+    summary = summarize(source.rows(["Product", "TotalPrice"], *filters), "Product")
+    box_fig = plotly_box(summary, title="Sales Distribution by Product", template="plotly_dark")
+    return summary.table, box_fig
+
+
+def heatmap_tab(source, filters):
+    corr = source.correlation(*filters)
+    heatmap_fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.columns, colorscale="Viridis", zmid=0))
+    heatmap_fig.update_layout(title="Correlation Heatmap", template="plotly_dark")
+    return corr, encode_figure(heatmap_fig)
+
+
+def forecast_tab(source, filters, cache):
+    monthly_sales = source.by_month("TotalPrice", *filters).reset_index()
+    forecast = forecast_series(monthly_sales["TotalPrice"], 6, cache=cache, trend="add", seasonal=None)
+    forecast_df = pd.DataFrame({
+        "Month": pd.date_range(start=monthly_sales["Month"].max() + pd.offsets.MonthBegin(1), periods=6, freq="MS"),
+        "Forecast": forecast
+    })
+    forecast_fig = px.line(monthly_sales, x="Month", y="TotalPrice", title="Sales Forecast", markers=True, template="plotly_dark")
+    forecast_fig.add_scatter(x=forecast_df["Month"], y=forecast_df["Forecast"], mode="lines+markers", name="Forecast",
+                             line=dict(color="orange"), hovertemplate="Forecast: ₹%{y:,.0f}<br>Date: %{x|%b %Y}")
+    return monthly_sales, encode_figure(forecast_fig)
+
+
+@st.cache_resource
+def tab_scheduler():
+    # Results are shared by every session; $SALES_RESULT_DIR keeps them across restarts
+    return TabScheduler(results=ResultCache(directory=os.environ.get("SALES_RESULT_DIR")))
+
+
+scheduler = tab_scheduler()
+
 # -----------------------------
 # TABS FOR BETTER LAYOUT
 # -----------------------------
-tabs = st.tabs(["📈 Sales Trend", "📊 Metrics by Region", "📦 Product Distribution", "🔮 Forecasting"])
+TAB_LABELS = ["📈 Sales Trend", "📊 Metrics by Region", "📦 Product Distribution", "🔮 Forecasting"]
+TAB_JOBS = [["trend"], ["region"], ["box", "heatmap"], ["forecast"]]
+
+# Only the open tab runs; the others are computed in the background meanwhile.
+tabs = st.tabs(TAB_LABELS, key="tab", on_change="rerun")
+open_jobs = next((names for tab, names in zip(tabs, TAB_JOBS) if tab.open), TAB_JOBS[0])
+
+
+def remembered(key, default):
+    """Value of widget ``key``, kept while its tab is closed and the widget's own state is dropped."""
+    value = st.session_state.get(key, st.session_state.get(f"_{key}", default))
+    st.session_state[f"_{key}"] = value
+    return value
+
+
+granularity = remembered("granularity", "D")
+windows = remembered("windows", list(WINDOWS[granularity][:1]))
+if any(w not in WINDOWS[granularity] for w in windows):
+    # The granularity changed; start from its default window.
+    windows = st.session_state["_windows"] = list(WINDOWS[granularity][:1])
+    st.session_state.pop("windows", None)
+windows = sorted(windows)
+metric = remembered("metric", METRICS[0])
+
+state = filter_key((data_source, source.fingerprint()), selection(region_filter), selection(product_filter),
+                   start_date, end_date)
+jobs = {
+    "trend": (filter_key(state, granularity, windows), trend_tab, (source, filters, granularity, windows)),
+    "region": (filter_key(state, metric), region_tab, (source, filters, metric)),
+    "box": (state, box_tab, (source, filters)),
+    "heatmap": (state, heatmap_tab, (source, filters)),
+    "forecast": (state, forecast_tab, (source, filters, forecast_cache())),
+}
+# Open tab on its own pool; jobs queued for this session's previous filters are
+# cancelled unless another session wants them too.
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+st.session_state["tab_jobs"] = scheduler.schedule(jobs, st.session_state.get("tab_jobs", ()),
+                                                  urgent=open_jobs, owner=session_id)
+
+
+def tab_result(name):
+    key, fn, args = jobs[name]
+    return scheduler.result(name, key, fn, *args)
+
 
 # -----------------------------
 # SALES TREND TAB
 # -----------------------------
 with tabs[0]:
-    st.subheader("Sales Trend Over Time")
-    trend_df = filtered_df.groupby("Date")["TotalPrice"].sum().reset_index()
-    trend_df["Rolling_Avg"] = trend_df["TotalPrice"].rolling(7, min_periods=1).mean()
-    trend_fig = px.line(trend_df, x="Date", y="TotalPrice", title="Daily Sales", markers=True, template="plotly_dark")
-    trend_fig.add_scatter(x=trend_df["Date"], y=trend_df["Rolling_Avg"], mode="lines", name="7-Day Avg", line=dict(dash="dash"))
-    st.plotly_chart(trend_fig, use_container_width=True)
+    if tabs[0].open:
+        st.subheader("Sales Trend Over Time")
+        col1, col2 = st.columns(2)
+        col1.selectbox("Granularity", list(GRANULARITIES), index=list(GRANULARITIES).index(granularity),
+                       format_func=GRANULARITIES.get, key="granularity")
+        col2.multiselect("Rolling Averages", WINDOWS[granularity], default=windows,
+                         format_func=lambda w: f"{w}-{UNITS[granularity]}", key="windows")
+        with profile.stage("trend", cache=scheduler) as stage:
+            trend_df, trend_fig = tab_result("trend")
+            stage.add_rows(len(trend_df))
+        with profile.stage("render"):
+            st.plotly_chart(trend_fig, width='stretch')
 
 # -----------------------------
 # METRICS BY REGION TAB
 # -----------------------------
 with tabs[1]:
-    st.subheader("Metrics by Region")
-    metric = st.selectbox("Select Metric", ["TotalPrice", "Quantity", "Discount"])
-    bar_fig = px.bar(filtered_df.groupby("Region")[metric].sum().reset_index(), x="Region", y=metric, color="Region",
-                     title=f"{metric} by Region", template="plotly_dark")
-    st.plotly_chart(bar_fig, use_container_width=True)
+    if tabs[1].open:
+        st.subheader("Metrics by Region")
+        st.selectbox("Select Metric", METRICS, index=METRICS.index(metric), key="metric")
+        with profile.stage("region", cache=scheduler) as stage:
+            region_totals, bar_fig = tab_result("region")
+            stage.add_rows(len(region_totals))
+        with profile.stage("render"):
+            st.plotly_chart(bar_fig, width='stretch')
 
 # -----------------------------
 # PRODUCT DISTRIBUTION TAB
 # -----------------------------
 with tabs[2]:
-    st.subheader("Sales Distribution by Product")
-    col1, col2 = st.columns(2)
-    with col1:
-        box_fig = px.box(filtered_df, x="Product", y="TotalPrice", color="Product", template="plotly_dark",
-                         title="Sales Distribution by Product")
-        st.plotly_chart(box_fig, use_container_width=True)
-    with col2:
-        numeric_df = filtered_df.drop(columns=["OrderID"]).select_dtypes(include=["int64", "float64"])
-        corr = numeric_df.corr()
-        heatmap_fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.columns, colorscale="Viridis", zmid=0))
-        heatmap_fig.update_layout(title="Correlation Heatmap", template="plotly_dark")
-        st.plotly_chart(heatmap_fig, use_container_width=True)
+    if tabs[2].open:
+        st.subheader("Sales Distribution by Product")
+        col1, col2 = st.columns(2)
+        with col1:
+            with profile.stage("distribution", cache=scheduler) as stage:
+                box_stats, box_fig = tab_result("box")
+                stage.add_rows(box_stats["count"].sum())
+            with profile.stage("render"):
+                st.plotly_chart(box_fig, width='stretch')
+        with col2:
+            with profile.stage("correlation", cache=scheduler):
+                corr, heatmap_fig = tab_result("heatmap")
+            with profile.stage("render"):
+                st.plotly_chart(heatmap_fig, width='stretch')
 
 # -----------------------------
 # FORECASTING TAB
 # -----------------------------
 with tabs[3]:
-    st.subheader("Sales Forecast (Next 6 Months)")
-    monthly_sales = filtered_df.groupby("Month")["TotalPrice"].sum().reset_index()
-    monthly_sales["Month"] = pd.to_datetime(monthly_sales["Month"])
-    model = ExponentialSmoothing(monthly_sales["TotalPrice"], trend="add", seasonal=None).fit()
-    forecast = model.forecast(6)
-    forecast_df = pd.DataFrame({
-        "Month": pd.date_range(start=monthly_sales["Month"].max() + pd.offsets.MonthBegin(1), periods=6, freq="MS"),
-        "Forecast": forecast
-    })
-    forecast_fig = px.line(monthly_sales, x="Month", y="TotalPrice", title="Sales Forecast", markers=True, template="plotly_dark")
-    forecast_fig.add_scatter(x=forecast_df["Month"], y=forecast_df["Forecast"], mode="lines+markers", name="Forecast",
-                             line=dict(color="orange"), hovertemplate="Forecast: ₹%{y:,.0f}<br>Date: %{x|%b %Y}")
-    st.plotly_chart(forecast_fig, use_container_width=True)
+    if tabs[3].open:
+        st.subheader("Sales Forecast (Next 6 Months)")
+        with profile.stage("forecast", cache=scheduler) as stage:
+            monthly_sales, forecast_fig = tab_result("forecast")
+            stage.add_rows(len(monthly_sales))
+        with profile.stage("render"):
+            st.plotly_chart(forecast_fig, width='stretch')
 
 # -----------------------------
 # EXPORT DASHBOARD
 # -----------------------------
 st.subheader("💾 Export Dashboard")
 if st.button("Export Charts to ZIP"):
-    files = ["trend.html", "region.html", "box.html", "heatmap.html", "forecast.html"]
-    pio.write_html(trend_fig, "trend.html", auto_open=False)
-    pio.write_html(bar_fig, "region.html", auto_open=False)
-    pio.write_html(box_fig, "box.html", auto_open=False)
-    pio.write_html(heatmap_fig, "heatmap.html", auto_open=False)
-    pio.write_html(forecast_fig, "forecast.html", auto_open=False)
-    with zipfile.ZipFile("dashboard.zip", 'w') as zipf:
-        for file in files:
-            zipf.write(file)
+    # Every tab's figure, whether or not its tab has been opened
+    archive = export_zip({f"{name}.html": tab_result(name)[1] for names in TAB_JOBS for name in names})
     st.success("✅ Dashboard exported as dashboard.zip")
+    st.download_button("Download dashboard.zip", archive, file_name="dashboard.zip", mime="application/zip")
+
+# -----------------------------
+# STAGE TIMINGS
+# -----------------------------
+profile.finish()
+if show_profile:
+    render_panel(profile)
+    st.sidebar.caption("Result cache: {hits} hits, {misses} misses, {entries} entries, {bytes:,} bytes"
+                       .format(**scheduler.results.stats()))
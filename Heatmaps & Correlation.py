@@ -1,14 +1,13 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from salesdash.correlation import CorrelationEngine, numeric_columns
+from salesdash.loader import load_sales
+
 # ---------------------------------------
 # 1. Load Dataset
 # ---------------------------------------
-df = pd.read_excel("Product-Sales-Region.xlsx")
-
-# Clean column names
-df.columns = df.columns.str.strip()
+df = load_sales("Product-Sales-Region.xlsx")
 
 print("Dataset Columns:")
 print(df.columns)
@@ -16,15 +15,15 @@ print(df.columns)
 # ---------------------------------------
 # 2. Select Numerical Columns Only
 # ---------------------------------------
-numeric_df = df.select_dtypes(include=["int64", "float64"])
+numeric_cols = numeric_columns(df)
 
 print("\nNumerical Columns Used for Correlation:")
-print(numeric_df.columns)
+print(numeric_cols)
 
 # ---------------------------------------
-# 3. Correlation Matrix
+# 3. Correlation Matrix (merged from per-cell sufficient statistics)
 # ---------------------------------------
-corr_matrix = numeric_df.corr()
+corr_matrix = CorrelationEngine.from_frame(df, numeric_cols).matrix()
 
 print("\nCorrelation Matrix:")
 print(corr_matrix)
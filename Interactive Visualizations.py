@@ -1,22 +1,21 @@
-import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
+
+from salesdash.charts import animated_scatter, metric_dropdown_bar
+from salesdash.downsample import downsample
+from salesdash.loader import load_sales
+from salesdash.schema import month_label
 
 # ---------------------------------------
 # 1. Load Dataset
 # ---------------------------------------
-df = pd.read_excel("Product-Sales-Region.xlsx")
-df.columns = df.columns.str.strip()
-
-# Convert date columns
-df["Date"] = pd.to_datetime(df["Date"])
-df["Month"] = df["Date"].dt.to_period("M").astype(str)
+df = load_sales("Product-Sales-Region.xlsx")
 
 # ---------------------------------------
 # 2. Interactive Line Chart (Hover Effects)
 # ---------------------------------------
+# Thin each region's series to a point budget; peaks are kept
 fig_line = px.line(
-    df.sort_values("Date"),
+    downsample(df.sort_values("Date"), "Date", "TotalPrice", method="minmax", by="Region"),
     x="Date",
     y="TotalPrice",
     color="Region",
@@ -41,39 +40,12 @@ fig_line.show()
 # ---------------------------------------
 # 3. Dropdown Menu – Sales by Metric
 # ---------------------------------------
-fig_dropdown = go.Figure()
-
-fig_dropdown.add_trace(
-    go.Bar(x=df["Region"], y=df["TotalPrice"], visible=True, name="Total Sales")
-)
-fig_dropdown.add_trace(
-    go.Bar(x=df["Region"], y=df["Quantity"], visible=False, name="Quantity Sold")
-)
-fig_dropdown.add_trace(
-    go.Bar(x=df["Region"], y=df["Discount"], visible=False, name="Discount")
-)
-
-fig_dropdown.update_layout(
-    title="Sales Metrics by Region (Dropdown)",
-    xaxis_title="Region",
-    yaxis_title="Value",
-    updatemenus=[
-        dict(
-            buttons=[
-                dict(label="Total Sales", method="update",
-                     args=[{"visible": [True, False, False]},
-                           {"yaxis": {"title": "Total Sales"}}]),
-                dict(label="Quantity", method="update",
-                     args=[{"visible": [False, True, False]},
-                           {"yaxis": {"title": "Quantity"}}]),
-                dict(label="Discount", method="update",
-                     args=[{"visible": [False, False, True]},
-                           {"yaxis": {"title": "Discount"}}])
-            ],
-            direction="down",
-            showactive=True
-        )
-    ]
+# Bars come from one group-by per region rather than one bar per order
+fig_dropdown = metric_dropdown_bar(
+    df,
+    by="Region",
+    metrics={"TotalPrice": "Total Sales", "Quantity": "Quantity", "Discount": "Discount"},
+    title="Sales Metrics by Region (Dropdown)"
 )
 
 fig_dropdown.show()
@@ -81,16 +53,15 @@ fig_dropdown.show()
 # ---------------------------------------
 # 4. Animated Scatter Plot – Monthly Sales
 # ---------------------------------------
-fig_anim = px.scatter(
+# One bubble per (Month, Region, Product) instead of one per order
+fig_anim = animated_scatter(
     df,
-    x="Quantity",
-    y="TotalPrice",
-    size="UnitPrice",
+    frame="Month",
     color="Region",
-    animation_frame="Month",
-    hover_name="Product",
+    label="Product",
     title="Monthly Sales Animation",
-    size_max=40
+    size_max=40,
+    frame_format=month_label
 )
 
 fig_anim.update_layout(
@@ -1,15 +1,13 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from salesdash.correlation import CorrelationEngine
+from salesdash.loader import load_sales
+
 # ---------------------------------------
 # 1. Load Dataset
 # ---------------------------------------
-df = pd.read_excel("Product-Sales-Region.xlsx")
-df.columns = df.columns.str.strip()
-
-# Convert date column
-df["Date"] = pd.to_datetime(df["Date"])
+df = load_sales("Product-Sales-Region.xlsx")
 
 # ---------------------------------------
 # 2. Global Theme (Coordinated Styling)
@@ -71,8 +69,7 @@ axes[1, 0].tick_params(axis='x', rotation=45)
 # ---------------------------------------
 # Plot 4: Heatmap – Correlation Matrix
 # ---------------------------------------
-numeric_df = df.select_dtypes(include=["int64", "float64"])
-corr = numeric_df.corr()
+corr = CorrelationEngine.from_frame(df).matrix()
 
 sns.heatmap(
     corr,
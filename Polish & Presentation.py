@@ -2,13 +2,18 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-import plotly.io as pio
-from pptx import Presentation
-from pptx.util import Inches
-import pdfkit
 import os
-import zipfile
+
+from salesdash.assets import logo
+from salesdash.charts import encode_figure
+from salesdash.deck import FORMATS, ImageCache, submit_report
+from salesdash.downsample import downsample
+from salesdash.forecast import ForecastCache, forecast_series
+from salesdash.index import COMPARISON_MODES, period_delta
+from salesdash.loader import CACHE_DIRNAME
+from salesdash.profiler import RerunProfile, render_panel
+from salesdash.sources import open_source, source_spec
+from salesdash.stats import plotly_box, summarize
 
 # -----------------------------
 # PAGE CONFIG & BRANDING
@@ -19,54 +24,97 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-logo_path = r"G:\Data Science Intership\Interactive Sales Dashboard\logo.png"
+# Stage timings for this rerun; logged and exported by profile.finish() below
+profile = RerunProfile("presentation")
+
+# The logo ships next to this script
+logo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo.jpg")
 if os.path.exists(logo_path):
-    st.sidebar.image(logo_path, width='stretch')
+    with profile.stage("logo"):
+        st.sidebar.image(logo(logo_path, "sidebar"), width='stretch')
 st.sidebar.markdown("## **Your Company Name**\n### Sales Dashboard")
 
 # -----------------------------
 # LOAD DATA
 # -----------------------------
-df = pd.read_excel(r"G:\Data Science Intership\Interactive Sales Dashboard\Product-Sales-Region.xlsx")
-df.columns = df.columns.str.strip()
-df["Date"] = pd.to_datetime(df["Date"])
-df["Month"] = df["Date"].dt.to_period("M").astype(str)
+# Workbook, Parquet dataset or SQL database; override with $SALES_SOURCE
+data_source = source_spec("Product-Sales-Region.xlsx")
+
+
+@st.cache_resource
+def build_source(spec):
+    return open_source(spec)
+
+
+@st.cache_resource
+def forecast_cache():
+    return ForecastCache()
+
+
+# One source per process, shared by every session; filters and group-bys run
+# inside it (in memory, in Arrow or in SQL) and only aggregates come back.
+source = build_source(data_source)
 
 # -----------------------------
 # SIDEBAR FILTERS
 # -----------------------------
 st.sidebar.header("Filters 🔎")
-region_filter = st.sidebar.multiselect("Select Region", df["Region"].unique(), df["Region"].unique())
-product_filter = st.sidebar.multiselect("Select Product", df["Product"].unique(), df["Product"].unique())
-start_date, end_date = st.sidebar.date_input("Select Date Range", [df["Date"].min(), df["Date"].max()])
+with profile.stage("load", cache=source):
+    region_options = source.categories("Region")
+    product_options = source.categories("Product")
+    date_bounds = list(source.date_bounds())
+region_filter = st.sidebar.multiselect("Select Region", region_options, region_options)
+product_filter = st.sidebar.multiselect("Select Product", product_options, product_options)
+start_date, end_date = st.sidebar.date_input("Select Date Range", date_bounds)
+comparison = st.sidebar.selectbox("Compare Sales Against", list(COMPARISON_MODES), format_func=COMPARISON_MODES.get)
+show_profile = st.sidebar.checkbox("⏱ Show stage timings", value=False)
 
-filtered_df = df[
-    (df["Region"].isin(region_filter)) &
-    (df["Product"].isin(product_filter)) &
-    (df["Date"] >= pd.to_datetime(start_date)) &
-    (df["Date"] <= pd.to_datetime(end_date))
-]
+filters = (region_filter, product_filter, start_date, end_date)
 
 # -----------------------------
 # KPI METRICS
 # -----------------------------
-total_sales = filtered_df["TotalPrice"].sum()
-total_orders = filtered_df["OrderID"].nunique()
-avg_discount = filtered_df["Discount"].mean()
+with profile.stage("kpis", cache=source):
+    kpis = source.kpis(*filters)
+    total_sales = kpis["total_sales"]
+    total_orders = kpis["total_orders"]
+    avg_discount = kpis["avg_discount"]
 
-prev_df = df[
-    (df["Region"].isin(region_filter)) &
-    (df["Product"].isin(product_filter)) &
-    (df["Date"] < pd.to_datetime(start_date))
-]
-prev_sales = prev_df["TotalPrice"].sum() if not prev_df.empty else 0
-sales_delta = ((total_sales - prev_sales) / prev_sales * 100) if prev_sales != 0 else 0
+    sales_delta = period_delta(source, region_filter, product_filter, start_date, end_date, comparison)
 
 col1, col2, col3 = st.columns(3)
-col1.metric("💰 Total Sales", f"₹{total_sales:,.0f}", f"{sales_delta:+.2f}% vs previous period")
+col1.metric("💰 Total Sales", f"₹{total_sales:,.0f}", f"{sales_delta:+.2f}% vs {COMPARISON_MODES[comparison]}")
 col2.metric("🧾 Total Orders", total_orders)
 col3.metric("🏷 Avg Discount", f"{avg_discount:.2f}")
 
+
+@st.cache_resource
+def report_images():
+    return ImageCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_DIRNAME, "images"))
+
+
+REPORT_FORMATS = (("pdf", "PDF"), ("pptx", "PowerPoint"))
+
+
+def report_downloads(polling):
+    pending = False
+    for fmt, label in REPORT_FORMATS:
+        job = st.session_state.get(f"report_{fmt}")
+        if job is None:
+            continue
+        if not job.done():
+            st.info(f"⏳ Generating {label} report...")
+            pending = True
+        elif job.exception() is not None:
+            st.error(f"{label} export failed: {job.exception()}")
+        else:
+            st.download_button(f"Download dashboard.{fmt}", job.result()[fmt], file_name=f"dashboard.{fmt}",
+                               mime=FORMATS[fmt], key=f"download_{fmt}")
+    if polling and not pending:
+        # Done: a full rerun registers the fragment again without its timer.
+        st.rerun()
+
+
 # -----------------------------
 # TABS FOR ORGANIZATION
 # -----------------------------
@@ -77,15 +125,22 @@ tabs = st.tabs(["📈 Overview", "📊 Analysis", "🔮 Forecast", "💾 Reports
 # -----------------------------
 with tabs[0]:
     st.subheader("Sales Trend Overview")
-    trend_df = filtered_df.groupby("Date")["TotalPrice"].sum().reset_index()
-    trend_df["Rolling_Avg"] = trend_df["TotalPrice"].rolling(7, min_periods=1).mean()
-
-    trend_fig = px.line(trend_df, x="Date", y="TotalPrice",
-                        title="Daily Sales Trend", markers=True,
-                        template="plotly_dark")
-    trend_fig.add_scatter(x=trend_df["Date"], y=trend_df["Rolling_Avg"], mode="lines",
-                          name="7-Day Avg", line=dict(dash="dash", color="orange"))
-    st.plotly_chart(trend_fig, width='stretch')
+    with profile.stage("trend") as stage:
+        trend_df = source.trend("TotalPrice", *filters, windows=(7,)).reset_index()
+
+        # Rolling average uses every day; only the plotted points are thinned out.
+        sales_points = downsample(trend_df, "Date", "TotalPrice", method="minmax")
+        avg_points = downsample(trend_df, "Date", "Rolling_7")
+        trend_fig = px.line(sales_points, x="Date", y="TotalPrice",
+                            title="Daily Sales Trend", markers=True,
+                            template="plotly_dark")
+        trend_fig.add_scatter(x=avg_points["Date"], y=avg_points["Rolling_7"], mode="lines",
+                              name="7-Day Avg", line=dict(dash="dash", color="orange"))
+        # Dates and sales go out as binary typed arrays
+        encode_figure(trend_fig)
+        stage.add_rows(len(trend_df))
+    with profile.stage("render"):
+        st.plotly_chart(trend_fig, width='stretch')
 
 # -----------------------------
 # ANALYSIS TAB
@@ -93,52 +148,87 @@ with tabs[0]:
 with tabs[1]:
     st.subheader("Sales by Region & Product")
     metric = st.selectbox("Select Metric", ["TotalPrice", "Quantity", "Discount"])
-    region_metric_fig = px.bar(filtered_df.groupby("Region")[metric].sum().reset_index(),
-                               x="Region", y=metric, color="Region",
-                               title=f"{metric} by Region", template="plotly_dark")
-    st.plotly_chart(region_metric_fig, width='stretch')
+    with profile.stage("region") as stage:
+        region_totals = source.by_region(metric, *filters).reset_index()
+        region_metric_fig = px.bar(region_totals,
+                                   x="Region", y=metric, color="Region",
+                                   title=f"{metric} by Region", template="plotly_dark")
+        encode_figure(region_metric_fig)
+        stage.add_rows(len(region_totals))
+    with profile.stage("render"):
+        st.plotly_chart(region_metric_fig, width='stretch')
 
     col1, col2 = st.columns(2)
     with col1:
-        box_fig = px.box(filtered_df, x="Product", y="TotalPrice", color="Product",
-                         template="plotly_dark", title="Sales Distribution by Product")
-        st.plotly_chart(box_fig, width='stretch')
+        with profile.stage("distribution") as stage:
+            # Quartiles, fences and outliers per product instead of every row
+            summary = summarize(source.rows(["Product", "TotalPrice"], *filters), "Product")
+            box_fig = plotly_box(summary, template="plotly_dark", title="Sales Distribution by Product")
+            stage.add_rows(summary.table["count"].sum())
+        with profile.stage("render"):
+            st.plotly_chart(box_fig, width='stretch')
     with col2:
-        numeric_df = filtered_df.drop(columns=["OrderID"]).select_dtypes(include=["int64","float64"])
-        corr = numeric_df.corr()
-        heatmap_fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.columns,
-                                           colorscale="Viridis", zmid=0))
-        heatmap_fig.update_layout(title="Correlation Heatmap", template="plotly_dark")
-        st.plotly_chart(heatmap_fig, width='stretch')
+        with profile.stage("correlation"):
+            corr = source.correlation(*filters)
+            heatmap_fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.columns,
+                                               colorscale="Viridis", zmid=0))
+            heatmap_fig.update_layout(title="Correlation Heatmap", template="plotly_dark")
+            encode_figure(heatmap_fig)
+        with profile.stage("render"):
+            st.plotly_chart(heatmap_fig, width='stretch')
 
 # -----------------------------
 # FORECAST TAB
 # -----------------------------
 with tabs[2]:
     st.subheader("Sales Forecast (Next 6 Months)")
-    monthly_sales = filtered_df.groupby("Month")["TotalPrice"].sum().reset_index()
-    monthly_sales["Month"] = pd.to_datetime(monthly_sales["Month"])
-    model = ExponentialSmoothing(monthly_sales["TotalPrice"], trend="add", seasonal=None).fit()
-    forecast = model.forecast(6)
-    forecast_df = pd.DataFrame({
-        "Month": pd.date_range(start=monthly_sales["Month"].max() + pd.offsets.MonthBegin(1),
-                               periods=6, freq="MS"),
-        "Forecast": forecast
-    })
-    forecast_fig = px.line(monthly_sales, x="Month", y="TotalPrice",
-                           title="Sales Forecast", markers=True, template="plotly_dark")
-    forecast_fig.add_scatter(x=forecast_df["Month"], y=forecast_df["Forecast"], mode="lines+markers",
-                             name="Forecast", line=dict(color="orange"),
-                             hovertemplate="Forecast: ₹%{y:,.0f}<br>Date: %{x|%b %Y}")
-    st.plotly_chart(forecast_fig, width='stretch')
+    with profile.stage("forecast", cache=forecast_cache()) as stage:
+        monthly_sales = source.by_month("TotalPrice", *filters).reset_index()
+        forecast = forecast_series(monthly_sales["TotalPrice"], 6, cache=forecast_cache(), trend="add", seasonal=None)
+        forecast_df = pd.DataFrame({
+            "Month": pd.date_range(start=monthly_sales["Month"].max() + pd.offsets.MonthBegin(1),
+                                   periods=6, freq="MS"),
+            "Forecast": forecast
+        })
+        forecast_fig = px.line(monthly_sales, x="Month", y="TotalPrice",
+                               title="Sales Forecast", markers=True, template="plotly_dark")
+        forecast_fig.add_scatter(x=forecast_df["Month"], y=forecast_df["Forecast"], mode="lines+markers",
+                                 name="Forecast", line=dict(color="orange"),
+                                 hovertemplate="Forecast: ₹%{y:,.0f}<br>Date: %{x|%b %Y}")
+        encode_figure(forecast_fig)
+        stage.add_rows(len(monthly_sales))
+    with profile.stage("render"):
+        st.plotly_chart(forecast_fig, width='stretch')
 
 # -----------------------------
 # REPORTS TAB
 # -----------------------------
 with tabs[3]:
     st.subheader("Export Reports")
+    report_figures = {
+        "Daily Sales Trend": trend_fig,
+        f"{metric} by Region": region_metric_fig,
+        "Sales Distribution by Product": box_fig,
+        "Correlation Heatmap": heatmap_fig,
+        "Sales Forecast": forecast_fig,
+    }
+    # Images are built off the script thread; buttons only queue the job.
     if st.button("Generate PDF"):
-        st.info("PDF generation coming soon!")
+        st.session_state["report_pdf"] = submit_report(report_figures, ["pdf"], title="Sales Dashboard Report",
+                                                       logo=logo(logo_path, "slide"), cache=report_images())
 
     if st.button("Generate PPT"):
-        st.info("PowerPoint export coming soon!")
+        st.session_state["report_pptx"] = submit_report(report_figures, ["pptx"], title="Sales Dashboard Report",
+                                                        logo=logo(logo_path, "slide"), cache=report_images())
+
+    # Poll once a second, and only while a report is being built
+    jobs = [st.session_state.get(f"report_{fmt}") for fmt, _ in REPORT_FORMATS]
+    polling = any(job is not None and not job.done() for job in jobs)
+    st.fragment(report_downloads, run_every=1 if polling else None)(polling)
+
+# -----------------------------
+# STAGE TIMINGS
+# -----------------------------
+profile.finish()
+if show_profile:
+    render_panel(profile)
@@ -1,18 +1,12 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from salesdash.loader import load_sales
+
 # ---------------------------------------
 # 1. Load Excel Dataset
 # ---------------------------------------
-df = pd.read_excel("Product-Sales-Region.xlsx")
-
-# Clean column names
-df.columns = df.columns.str.strip()
-
-# Convert date columns
-df["Date"] = pd.to_datetime(df["Date"])
-df["OrderDate"] = pd.to_datetime(df["OrderDate"])
+df = load_sales("Product-Sales-Region.xlsx")
 
 print("Columns:", df.columns.tolist())
 print(df.head())
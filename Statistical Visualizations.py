@@ -1,29 +1,35 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
 
+from salesdash.loader import load_sales
+from salesdash.stats import draw_box, draw_violin, summarize
+
 # ---------------------------------------
 # 1. Load Dataset
 # ---------------------------------------
-df = pd.read_excel("Product-Sales-Region.xlsx")
-
-# Clean column names
-df.columns = df.columns.str.strip()
+df = load_sales("Product-Sales-Region.xlsx")
 
 # ---------------------------------------
 # 2. Seaborn Theme
 # ---------------------------------------
 sns.set_theme(style="whitegrid", palette="Set2")
+palette = sns.color_palette()
+
+# ---------------------------------------
+# 2b. Per-group Summaries (computed once, reused by every plot)
+# ---------------------------------------
+region_stats = summarize(df, "Region", "TotalPrice")
+product_stats = summarize(df, "Product", "TotalPrice")
 
 # ---------------------------------------
 # 3. BOX PLOT – Total Sales by Region
 # ---------------------------------------
 plt.figure(figsize=(8, 4))
-sns.boxplot(
-    data=df,
-    x="Region",
-    y="TotalPrice",
+draw_box(
+    plt.gca(),
+    region_stats,
+    colors=palette,
     showmeans=True,
     meanprops={
         "marker": "o",
@@ -41,12 +47,11 @@ plt.show()
 # 4. VIOLIN PLOT – Total Sales by Product
 # ---------------------------------------
 plt.figure(figsize=(9, 4))
-sns.violinplot(
-    data=df,
-    x="Product",
-    y="TotalPrice",
-    inner="quartile",   # shows median & quartiles
-    cut=0
+draw_violin(
+    plt.gca(),
+    product_stats,
+    colors=palette,
+    inner="quartile"    # shows median & quartiles
 )
 
 plt.title("Sales Distribution by Product (Violin Plot)")
@@ -58,17 +63,17 @@ plt.show()
 # 5. BOX + VIOLIN COMBINATION
 # ---------------------------------------
 plt.figure(figsize=(9, 4))
-sns.violinplot(
-    data=df,
-    x="Region",
-    y="TotalPrice",
+draw_violin(
+    plt.gca(),
+    region_stats,
+    colors=palette,
     inner=None,
     alpha=0.6
 )
-sns.boxplot(
-    data=df,
-    x="Region",
-    y="TotalPrice",
+draw_box(
+    plt.gca(),
+    region_stats,
+    colors=palette,
     width=0.2,
     showfliers=False
 )
@@ -82,10 +87,10 @@ plt.show()
 # 6. STATISTICAL ANNOTATION – Mean & Median
 # ---------------------------------------
 plt.figure(figsize=(8, 4))
-ax = sns.boxplot(data=df, x="Region", y="TotalPrice")
+ax = draw_box(plt.gca(), region_stats, colors=palette)
 
-# Calculate statistics
-stats = df.groupby("Region")["TotalPrice"].agg(["mean", "median"])
+# Statistics come from the same summary as the box plot
+stats = region_stats.table[["mean", "median"]]
 
 # Add annotations
 for i, region in enumerate(stats.index):
@@ -1,19 +1,17 @@
+import os
+
 import streamlit as st
-from PIL import Image
+
+from salesdash.assets import LOGO_WIDTHS, logo
 
 # -----------------------------
 # LOGO CONFIGURATION
 # -----------------------------
-logo_path = r"G:/Data Science Intership/Interactive Sales Dashboard/logo.jpg"  # use raw string or forward slashes
-max_width = 250  # max width for display
-
-# Load the logo
-logo = Image.open(logo_path)
+logo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo.jpg")  # ships next to this script
+max_width = LOGO_WIDTHS["sidebar"]  # max width for display
 
-# Resize while keeping aspect ratio
-width_percent = max_width / float(logo.size[0])
-new_height = int(float(logo.size[1]) * width_percent)
-logo_resized = logo.resize((max_width, new_height))
+# Pre-sized variants are generated once per logo file and served from memory
+logo_resized = logo(logo_path, "sidebar")
 
 # Display logo in sidebar
 st.sidebar.image(logo_resized, width=max_width)
@@ -0,0 +1,106 @@
+"""Pre-sized logo variants, generated once per source image.
+
+The source is decoded once at the size of the largest variant (JPEG draft
+mode lets libjpeg scale by 1/2, 1/4 or 1/8 while decoding), and each smaller
+variant is derived from that with ``Image.reduce`` and ``thumbnail``.
+Results are written to ``.sales_cache/assets`` under the source's content
+hash and kept in memory, so a rerun only pays for an ``os.stat``.
+"""
+
+import io
+import os
+import threading
+
+from PIL import Image
+
+from salesdash.loader import CACHE_DIRNAME, source_fingerprint
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+# variant -> target width in pixels
+LOGO_WIDTHS = {"sidebar": 250, "header": 600, "slide": 1200}
+ASSET_DIRNAME = "assets"
+
+# path -> ((mtime_ns, size), digest)
+_DIGESTS = {}
+# (digest, sorted widths) -> {variant: bytes}
+_MEMO = {}
+_LOCK = threading.Lock()
+
+
+def _asset_path(path, digest, width, ext):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), CACHE_DIRNAME, ASSET_DIRNAME, f"{stem}-{digest}-w{width}.{ext}")
+
+
+def _shrink(image, width):
+    """``image`` scaled down to ``width`` (never up), keeping the aspect ratio."""
+    factor = image.width // width
+    if factor > 1:
+        image = image.reduce(factor)
+    image = image.copy()
+    image.thumbnail((width, image.height), Image.LANCZOS)
+    return image
+
+
+def _encode(image, ext):
+    buffer = io.BytesIO()
+    if ext == "png":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.convert("RGB").save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _render(path, widths, ext):
+    with Image.open(path) as image:
+        largest = max(widths.values())
+        image.draft(image.mode, (largest, max(1, largest * image.height // image.width)))
+        image.load()
+        out = {}
+        for name, width in sorted(widths.items(), key=lambda kv: -kv[1]):
+            image = _shrink(image, width)
+            out[name] = _encode(image, ext)
+        return out
+
+
+def logo_variants(path, widths=LOGO_WIDTHS):
+    """``{variant: encoded image bytes}`` for the logo at ``path``."""
+    path = os.path.abspath(path)
+    with _LOCK:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = _DIGESTS.get(path)
+        if entry is None or entry[0] != stamp:
+            entry = _DIGESTS[path] = (stamp, source_fingerprint(path)[2])
+        digest = entry[1]
+        key = (digest, tuple(sorted(widths.items())))
+        if key in _MEMO:
+            return _MEMO[key]
+
+        ext = "png" if path.lower().endswith(".png") else "jpg"
+        targets = {name: _asset_path(path, digest, w, ext) for name, w in widths.items()}
+        if all(os.path.exists(t) for t in targets.values()):
+            variants = {}
+            for name, target in targets.items():
+                with open(target, "rb") as f:
+                    variants[name] = f.read()
+        else:
+            variants = _render(path, widths, ext)
+            os.makedirs(os.path.dirname(targets[next(iter(targets))]), exist_ok=True)
+            for name, target in targets.items():
+                tmp = f"{target}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(variants[name])
+                os.replace(tmp, target)
+
+        _MEMO[key] = variants
+        return variants
+
+
+def logo(path, variant="sidebar"):
+    """Encoded bytes of one logo variant, or ``None`` if ``path`` does not exist."""
+    if not os.path.exists(path):
+        return None
+    return logo_variants(path)[variant]
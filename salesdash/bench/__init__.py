@@ -0,0 +1,8 @@
+"""Scaling benchmarks for the dashboard pipeline.
+
+:mod:`salesdash.bench.synthetic` writes datasets shaped like the sales
+workbook at any size; :mod:`salesdash.bench.run` times each stage of
+``Dashboard Integration.py`` on them and records the results as JSON.
+
+    python -m salesdash.bench.run --rows 10000 1000000 --output bench.json
+"""
@@ -0,0 +1,239 @@
+"""Time each stage of ``Dashboard Integration.py`` on synthetic data.
+
+Stages mirror one cold rerun of the dashboard over a :class:`FrameSource`:
+parsing the export, reloading the typed Parquet cache, building the cube,
+index and correlation engine, then the filter, KPIs, daily trend, correlation
+matrix, forecast fit, figure build and figure JSON.  Each stage records wall
+time, the peak of Python-tracked allocations (``tracemalloc``, which covers
+NumPy and pandas buffers) and the process's peak RSS so far.  Results are
+written as JSON together with the commit and library versions, and a
+previous results file can be compared against.
+
+    python -m salesdash.bench.run --rows 10000 1000000 --output bench.json
+    python -m salesdash.bench.run --rows 10000 --compare bench.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.express as px
+import plotly.graph_objects as go
+
+from salesdash.bench.synthetic import DAYS, PRODUCTS, REGIONS, write_synthetic
+from salesdash.charts import encode_figure
+from salesdash.downsample import downsample
+from salesdash.forecast import ForecastCache, forecast_series
+from salesdash.index import period_delta
+from salesdash.loader import cache_path, clear_memo, load_sales, source_fingerprint
+from salesdash.sources import FrameSource
+from salesdash.stats import plotly_box, summarize
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+DEFAULT_ROWS = (10_000, 100_000, 1_000_000)
+DATA_DIR = os.path.join(tempfile.gettempdir(), "salesdash-bench")
+
+
+def _max_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# -----------------------------
+# TIMING
+# -----------------------------
+class StageTimer:
+    """Runs stages one after another and records time and peak memory of each."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = []
+
+    def run(self, name, fn):
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - start
+        record = {"stage": name, "seconds": seconds}
+        if self.trace_memory:
+            record["peak_bytes"] = tracemalloc.get_traced_memory()[1] - base
+        record["max_rss_bytes"] = _max_rss()
+        self.stages.append(record)
+        return value
+
+
+# -----------------------------
+# STAGES (as in Dashboard Integration.py)
+# -----------------------------
+def typical_filters(source):
+    """Half the regions and products over the last twelve months."""
+    regions = source.categories("Region")
+    products = source.categories("Product")
+    first, last = source.date_bounds()
+    start = max(first, last - pd.DateOffset(years=1))
+    return regions[:max(1, len(regions) // 2)], products[:max(1, len(products) // 2)], start, last
+
+
+def _trend(source, filters):
+    return source.trend("TotalPrice", *filters, windows=(7,)).reset_index()
+
+
+def _forecast(source, filters):
+    monthly_sales = source.by_month("TotalPrice", *filters).reset_index()
+    forecast = forecast_series(monthly_sales["TotalPrice"], 6, cache=ForecastCache(), trend="add", seasonal=None)
+    return monthly_sales, forecast
+
+
+def _figures(trend_df, region_totals, box_rows, corr, monthly_sales, forecast):
+    sales_points = downsample(trend_df, "Date", "TotalPrice", method="minmax")
+    avg_points = downsample(trend_df, "Date", "Rolling_7")
+    trend_fig = px.line(sales_points, x="Date", y="TotalPrice", title="Daily Sales", markers=True, template="plotly_dark")
+    trend_fig.add_scatter(x=avg_points["Date"], y=avg_points["Rolling_7"], mode="lines", name="7-Day Avg")
+    bar_fig = px.bar(region_totals.reset_index(), x="Region", y="TotalPrice", color="Region", template="plotly_dark")
+    box_fig = plotly_box(summarize(box_rows, "Product"), template="plotly_dark")
+    heatmap_fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.columns, colorscale="Viridis", zmid=0))
+    forecast_fig = px.line(monthly_sales, x="Month", y="TotalPrice", markers=True, template="plotly_dark")
+    future = pd.date_range(monthly_sales["Month"].max() + pd.offsets.MonthBegin(1), periods=len(forecast), freq="MS")
+    forecast_fig.add_scatter(x=future, y=forecast, mode="lines+markers", name="Forecast")
+    return {"trend": encode_figure(trend_fig), "region": encode_figure(bar_fig), "box": box_fig,
+            "heatmap": encode_figure(heatmap_fig), "forecast": encode_figure(forecast_fig)}
+
+
+def bench_file(path, trace_memory=True):
+    """Run every stage against the CSV at ``path``; returns the stage records."""
+    timer = StageTimer(trace_memory)
+    clear_memo()
+    stale = cache_path(path, source_fingerprint(path)[2])
+    if os.path.exists(stale):
+        os.remove(stale)
+
+    df = timer.run("load", lambda: load_sales(path))
+    timer.stages[-1]["result_rows"] = len(df)
+    del df
+    clear_memo()
+    timer.run("load_cached", lambda: load_sales(path))
+
+    source = FrameSource(path)
+    timer.run("build", source._current)
+    filters = typical_filters(source)
+    box_rows = timer.run("filter", lambda: source.rows(["Product", "TotalPrice"], *filters))
+    timer.stages[-1]["result_rows"] = len(box_rows)
+    timer.run("kpis", lambda: (source.kpis(*filters), period_delta(source, *filters, "prior")))
+    trend_df = timer.run("trend", lambda: _trend(source, filters))
+    corr = timer.run("correlation", lambda: source.correlation(*filters))
+    monthly_sales, forecast = timer.run("forecast", lambda: _forecast(source, filters))
+    region_totals = source.by_region("TotalPrice", *filters)
+    figures = timer.run("figures", lambda: _figures(trend_df, region_totals, box_rows, corr, monthly_sales, forecast))
+    sizes = timer.run("figure_json", lambda: {name: len(fig.to_json()) for name, fig in figures.items()})
+    timer.stages[-1]["json_bytes"] = sizes
+    return timer.stages
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, regions=len(REGIONS), products=len(PRODUCTS), days=DAYS, seed=0,
+                   data_dir=DATA_DIR, trace_memory=True):
+    """Benchmark each dataset size and return the results document."""
+    if trace_memory:
+        tracemalloc.start()
+    runs = []
+    try:
+        for n in rows:
+            path = os.path.join(data_dir, f"sales-{n}-r{regions}-p{products}-d{days}-s{seed}.csv")
+            write_synthetic(path, n, regions=regions, products=products, days=days, seed=seed)
+            runs.append({"rows": n, "regions": regions, "products": products, "days": days,
+                         "stages": bench_file(path, trace_memory)})
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "plotly": plotly.__version__,
+            # tracemalloc slows allocation-heavy stages; compare like with like.
+            "trace_memory": trace_memory,
+        },
+        "runs": runs,
+    }
+
+
+def compare(current, baseline):
+    """Table of stage times in ``current`` relative to ``baseline`` (ratio > 1 is slower)."""
+    def table(doc):
+        return {(run["rows"], s["stage"]): s["seconds"] for run in doc["runs"] for s in run["stages"]}
+    now, before = table(current), table(baseline)
+    out = pd.DataFrame(
+        [(rows, stage, before[(rows, stage)], seconds) for (rows, stage), seconds in now.items()
+         if (rows, stage) in before],
+        columns=["rows", "stage", "baseline_s", "current_s"],
+    )
+    out["ratio"] = (out["current_s"] / out["baseline_s"]).round(2)
+    return out
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard stages on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS))
+    parser.add_argument("--regions", type=int, default=len(REGIONS))
+    parser.add_argument("--products", type=int, default=len(PRODUCTS))
+    parser.add_argument("--days", type=int, default=DAYS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="results JSON to compare against")
+    parser.add_argument("--no-trace-memory", action="store_true",
+                        help="skip tracemalloc (faster, but no per-stage peak)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.rows, args.regions, args.products, args.days, args.seed,
+                             args.data_dir, not args.no_trace_memory)
+    summary = pd.DataFrame([dict(rows=run["rows"], **s) for run in results["runs"] for s in run["stages"]])
+    print(summary[["rows", "stage", "seconds"] + [c for c in ("peak_bytes",) if c in summary]].to_string(index=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(results, json.load(f)).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Synthetic sales data shaped like ``Product-Sales-Region.xlsx``.
+
+Distributions follow the sample workbook: one order per row, uniform dates,
+quantities of 1-20, unit prices of 5-600, discounts in 5% steps up to 15%
+and ``TotalPrice = Quantity * UnitPrice * (1 - Discount)``.  Region and
+product names reuse the workbook's and are extended with numbered names
+when more are requested.  Generation is chunked and seeded per chunk, so a
+dataset of any size is reproducible and never held in memory whole.
+
+    python -m salesdash.bench.synthetic 1000000 sales-1m.csv --regions 20
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+REGIONS = ("Central", "East", "North", "South", "West")
+PRODUCTS = ("Chair", "Desk", "Laptop", "Monitor", "Phone", "Printer", "Tablet")
+START = "2023-01-01"
+DAYS = 911
+DISCOUNTS = (0.0, 0.05, 0.10, 0.15)
+CHUNK_ROWS = 1_000_000
+COLUMNS = ["Date", "OrderDate", "Region", "Product", "Quantity", "UnitPrice", "Discount", "TotalPrice", "OrderID"]
+
+
+def _names(base, n, label):
+    return list(base[:n]) + [f"{label} {i:02d}" for i in range(len(base) + 1, n + 1)]
+
+
+def synthetic_chunk(rows, offset=0, regions=len(REGIONS), products=len(PRODUCTS), days=DAYS,
+                    start=START, seed=0):
+    """``rows`` synthetic orders; ``offset`` numbers the order IDs and picks the seed."""
+    rng = np.random.default_rng([seed, offset])
+    dates = pd.Timestamp(start) + pd.to_timedelta(np.sort(rng.integers(0, days, rows)), unit="D")
+    quantity = rng.integers(1, 21, rows)
+    unit_price = np.round(rng.uniform(5.0, 600.0, rows), 2)
+    discount = rng.choice(np.asarray(DISCOUNTS), rows)
+    return pd.DataFrame({
+        "Date": dates,
+        "OrderDate": dates,
+        "Region": pd.Categorical.from_codes(rng.integers(0, regions, rows), _names(REGIONS, regions, "Region")),
+        "Product": pd.Categorical.from_codes(rng.integers(0, products, rows), _names(PRODUCTS, products, "Product")),
+        "Quantity": quantity,
+        "UnitPrice": unit_price,
+        "Discount": discount,
+        "TotalPrice": np.round(quantity * unit_price * (1 - discount), 2),
+        "OrderID": [f"SYN{i:09d}" for i in range(offset, offset + rows)],
+    }, columns=COLUMNS)
+
+
+def iter_synthetic(rows, chunk_rows=CHUNK_ROWS, **shape):
+    """Yield the dataset in chunks of at most ``chunk_rows`` rows."""
+    for offset in range(0, rows, chunk_rows):
+        yield synthetic_chunk(min(chunk_rows, rows - offset), offset, **shape)
+
+
+def write_synthetic(path, rows, chunk_rows=CHUNK_ROWS, **shape):
+    """Write a synthetic CSV to ``path`` (skipped if it already exists); returns ``path``."""
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    for i, chunk in enumerate(iter_synthetic(rows, chunk_rows, **shape)):
+        chunk.to_csv(tmp, mode="w" if i == 0 else "a", header=i == 0, index=False, date_format="%Y-%m-%d")
+    os.replace(tmp, path)
+    return path
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic sales CSV.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--regions", type=int, default=len(REGIONS))
+    parser.add_argument("--products", type=int, default=len(PRODUCTS))
+    parser.add_argument("--days", type=int, default=DAYS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_synthetic(args.path, args.rows, regions=args.regions, products=args.products,
+                    days=args.days, seed=args.seed)
+    print(f"Wrote {args.rows:,} rows to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
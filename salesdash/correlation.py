@@ -0,0 +1,151 @@
+"""Mergeable Pearson correlation over (Date, Region, Product) cells.
+
+Each cell stores, for every column pair (i, j) and the rows where both are
+present: the row count, the sums of x_i and x_i squared, and the sum of
+x_i * x_j.  Any filter's correlation matrix is the merge (sum) of its cells,
+new rows are folded into their cells without touching old rows, and the
+whole structure can be built chunk by chunk from a source that does not fit
+in memory.  Results match ``DataFrame.corr()`` (pairwise-complete Pearson).
+"""
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+CELL_KEYS = ("Date", "Region", "Product")
+EXCLUDE = ("OrderID", "Month")
+
+# Layout of the per-cell statistics array: [cell, stat, i, j]
+N, SUM, SUMSQ, CROSS = range(4)
+
+
+def numeric_columns(df):
+    return [c for c in df.select_dtypes(include="number").columns if c not in EXCLUDE]
+
+
+def _cell_stats(codes, n_cells, values):
+    """Pairwise sufficient statistics per cell for one batch of rows."""
+    k = values.shape[1]
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    m = valid.astype(np.float64)
+    out = np.zeros((n_cells, 4, k, k))
+    for i in range(k):
+        for j in range(i, k):
+            both = m[:, i] * m[:, j]
+            out[:, N, i, j] = np.bincount(codes, weights=both, minlength=n_cells)
+            out[:, SUM, i, j] = np.bincount(codes, weights=x[:, i] * both, minlength=n_cells)
+            out[:, SUM, j, i] = np.bincount(codes, weights=x[:, j] * both, minlength=n_cells)
+            out[:, SUMSQ, i, j] = np.bincount(codes, weights=x[:, i] ** 2 * both, minlength=n_cells)
+            out[:, SUMSQ, j, i] = np.bincount(codes, weights=x[:, j] ** 2 * both, minlength=n_cells)
+            out[:, CROSS, i, j] = np.bincount(codes, weights=x[:, i] * x[:, j], minlength=n_cells)
+            out[:, N, j, i] = out[:, N, i, j]
+            out[:, CROSS, j, i] = out[:, CROSS, i, j]
+    return out
+
+
+def pairwise_stats(values):
+    """Summed ``[stat, i, j]`` statistics of a block of rows, as one cell."""
+    return _cell_stats(np.zeros(len(values), dtype=np.int64), 1, values)[0]
+
+
+# -----------------------------
+# ENGINE
+# -----------------------------
+class CorrelationEngine:
+
+    def __init__(self, columns, keys=CELL_KEYS):
+        self.columns = list(columns)
+        self.keys = list(keys)
+        self._cell_ids = {}
+        self._cell_keys = []
+        self._stats = np.zeros((0, 4, len(self.columns), len(self.columns)))
+        self._key_arrays = None
+
+    @classmethod
+    def from_frame(cls, df, columns=None, keys=CELL_KEYS):
+        engine = cls(columns or numeric_columns(df), keys)
+        return engine.add(df)
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=None, keys=CELL_KEYS):
+        """Build from an iterable of DataFrames, e.g. ``pd.read_csv(..., chunksize=...)``."""
+        engine = None
+        for chunk in chunks:
+            if engine is None:
+                engine = cls(columns or numeric_columns(chunk), keys)
+            engine.add(chunk)
+        return engine
+
+    @property
+    def n_cells(self):
+        return len(self._cell_keys)
+
+    def add(self, df):
+        """Fold a batch of rows into the cells; cost is proportional to the batch."""
+        if not len(df):
+            return self
+        batch_keys = pd.MultiIndex.from_frame(df[self.keys].astype(object))
+        codes, uniques = pd.factorize(batch_keys)
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        batch = _cell_stats(codes.astype(np.int64), len(uniques), values)
+
+        targets = np.empty(len(uniques), dtype=np.int64)
+        new = []
+        for i, key in enumerate(uniques):
+            cell = self._cell_ids.get(key)
+            if cell is None:
+                cell = self._cell_ids[key] = len(self._cell_keys)
+                self._cell_keys.append(key)
+                new.append(i)
+            targets[i] = cell
+        if new:
+            grown = np.zeros((len(self._cell_keys),) + self._stats.shape[1:])
+            grown[:len(self._stats)] = self._stats
+            self._stats = grown
+            self._key_arrays = None
+        np.add.at(self._stats, targets, batch)
+        return self
+
+    def _keys(self):
+        if self._key_arrays is None:
+            frame = pd.DataFrame(self._cell_keys, columns=self.keys)
+            self._key_arrays = {k: frame[k].to_numpy() for k in self.keys}
+            if "Date" in self._key_arrays:
+                self._key_arrays["Date"] = pd.to_datetime(frame["Date"]).to_numpy()
+        return self._key_arrays
+
+    def merged(self, regions=None, products=None, start=None, end=None):
+        """Summed statistics of the cells matching the filters."""
+        keys = self._keys()
+        mask = np.ones(self.n_cells, dtype=bool)
+        if regions is not None:
+            mask &= np.isin(keys["Region"], list(regions))
+        if products is not None:
+            mask &= np.isin(keys["Product"], list(products))
+        if start is not None:
+            mask &= keys["Date"] >= pd.Timestamp(start).to_datetime64()
+        if end is not None:
+            mask &= keys["Date"] <= pd.Timestamp(end).to_datetime64()
+        return self._stats[mask].sum(axis=0)
+
+    def matrix(self, regions=None, products=None, start=None, end=None):
+        """Pearson correlation matrix for the rows matching the filters."""
+        return matrix_from_stats(self.merged(regions, products, start, end), self.columns)
+
+
+def matrix_from_stats(s, columns):
+    """Correlation matrix from one ``[stat, i, j]`` block of summed statistics.
+
+    Sources that aggregate elsewhere (e.g. in SQL) fill the same layout.
+    """
+    n, sx, sxx, sxy = s[N], s[SUM], s[SUMSQ], s[CROSS]
+    cov = n * sxy - sx * sx.T
+    var_i = n * sxx - sx ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[(n < 2) | (var_i <= 0) | (var_i.T <= 0)] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    return pd.DataFrame(corr, index=list(columns), columns=list(columns))
@@ -0,0 +1,209 @@
+"""Pre-aggregated (Date x Region x Product) cube behind the KPI row and charts.
+
+Every cell keeps the row count and, for each measure, the sum and sum of
+squares, so totals, means and variances for any selection of the sidebar
+filters are answered by summing cells.  Query cost depends on the number of
+distinct dates, regions and products, never on the number of orders, and
+appended rows are folded in with :meth:`SalesCube.add` the same way.
+"""
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+MEASURES = ("TotalPrice", "Quantity", "Discount")
+
+
+def _axis(series):
+    cat = pd.Categorical(series)
+    return pd.Index(cat.categories), cat.codes.astype(np.int64)
+
+
+def _regrid(arr, positions, shape):
+    """``arr`` placed at ``positions`` (one index array per axis) in zeros of ``shape``."""
+    out = np.zeros(shape, dtype=arr.dtype)
+    out[np.ix_(*positions)] = arr
+    return out
+
+
+# -----------------------------
+# CUBE
+# -----------------------------
+class SalesCube:
+    """Dense arrays of sufficient statistics indexed ``[date, region, product]``."""
+
+    def __init__(self, dates, regions, products, count, sums, sumsq, orders):
+        self.dates = dates
+        self.regions = regions
+        self.products = products
+        self.count = count
+        self.sums = sums
+        self.sumsq = sumsq
+        self._orders = orders
+
+    @classmethod
+    def from_frame(cls, df, measures=MEASURES):
+        dates, d_codes = _axis(df["Date"])
+        regions, r_codes = _axis(df["Region"])
+        products, p_codes = _axis(df["Product"])
+        shape = (len(dates), len(regions), len(products))
+        size = shape[0] * shape[1] * shape[2]
+        cell = (d_codes * shape[1] + r_codes) * shape[2] + p_codes
+
+        count = np.bincount(cell, minlength=size).reshape(shape)
+        sums, sumsq = {}, {}
+        for m in measures:
+            values = df[m].to_numpy(dtype=np.float64)
+            sums[m] = np.bincount(cell, weights=values, minlength=size).reshape(shape)
+            sumsq[m] = np.bincount(cell, weights=values * values, minlength=size).reshape(shape)
+
+        orders = OrderCounter.from_cells(cell, df["OrderID"], shape)
+        return cls(dates, np.asarray(regions), np.asarray(products), count, sums, sumsq, orders)
+
+    def add(self, df):
+        """A new cube with the rows of ``df`` folded in, or ``None``.
+
+        ``df`` must only hold orders the cube has not counted yet, as an
+        append to a store does.  The cost depends on the batch and the number
+        of cells, not on the rows already aggregated.  ``None`` means the
+        distinct-order counts cannot be merged (orders span several cells);
+        build a new cube from the whole frame then.
+        """
+        batch = SalesCube.from_frame(df, tuple(self.sums))
+        dates = self.dates.union(batch.dates)
+        regions = pd.Index(self.regions).union(pd.Index(batch.regions))
+        products = pd.Index(self.products).union(pd.Index(batch.products))
+        shape = (len(dates), len(regions), len(products))
+        old = (dates.get_indexer(self.dates), regions.get_indexer(self.regions),
+               products.get_indexer(self.products))
+        new = (dates.get_indexer(batch.dates), regions.get_indexer(batch.regions),
+               products.get_indexer(batch.products))
+
+        orders = self._orders.merge(batch._orders, old, new, shape)
+        if orders is None:
+            return None
+        sums = {m: _regrid(self.sums[m], old, shape) + _regrid(batch.sums[m], new, shape) for m in self.sums}
+        sumsq = {m: _regrid(self.sumsq[m], old, shape) + _regrid(batch.sumsq[m], new, shape) for m in self.sumsq}
+        count = _regrid(self.count, old, shape) + _regrid(batch.count, new, shape)
+        return SalesCube(dates, np.asarray(regions), np.asarray(products), count, sums, sumsq, orders)
+
+    def _positions(self, labels, axis):
+        if labels is None:
+            return np.arange(len(axis))
+        pos = pd.Index(axis).get_indexer(list(labels))
+        return np.unique(pos[pos >= 0])
+
+    def query(self, regions=None, products=None, start=None, end=None):
+        """Select the cells matching the filters; date bounds are inclusive."""
+        lo = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        return CubeView(self, slice(lo, hi),
+                        self._positions(regions, self.regions),
+                        self._positions(products, self.products))
+
+
+class CubeView:
+    """A filtered selection of a :class:`SalesCube`."""
+
+    def __init__(self, cube, dates, regions, products):
+        self.cube = cube
+        self._dates = dates
+        self._regions = regions
+        self._products = products
+
+    def _cells(self, arr):
+        return arr[self._dates][:, self._regions][:, :, self._products]
+
+    @property
+    def count(self):
+        return int(self._cells(self.cube.count).sum())
+
+    def total(self, measure="TotalPrice"):
+        return float(self._cells(self.cube.sums[measure]).sum())
+
+    def mean(self, measure):
+        n = self.count
+        return self.total(measure) / n if n else float("nan")
+
+    def var(self, measure, ddof=1):
+        n = self.count
+        if n <= ddof:
+            return float("nan")
+        s = self.total(measure)
+        ss = float(self._cells(self.cube.sumsq[measure]).sum())
+        return max(ss - s * s / n, 0.0) / (n - ddof)
+
+    def nunique_orders(self):
+        return self.cube._orders.count(self)
+
+    def _grouped(self, measure, axis, labels, name):
+        counts = self._cells(self.cube.count).sum(axis=axis)
+        sums = self._cells(self.cube.sums[measure]).sum(axis=axis)
+        keep = counts > 0
+        return pd.Series(sums[keep], index=pd.Index(labels[keep], name=name), name=measure)
+
+    def by_date(self, measure="TotalPrice"):
+        return self._grouped(measure, (1, 2), self.cube.dates[self._dates], "Date")
+
+    def by_region(self, measure="TotalPrice"):
+        return self._grouped(measure, (0, 2), self.cube.regions[self._regions], "Region")
+
+    def by_product(self, measure="TotalPrice"):
+        return self._grouped(measure, (0, 1), self.cube.products[self._products], "Product")
+
+    def by_month(self, measure="TotalPrice"):
+        """Monthly sums indexed by the first day of each month."""
+        daily = self.by_date(measure)
+        month = daily.index.to_period("M").to_timestamp()
+        return daily.groupby(month.rename("Month")).sum()
+
+
+# -----------------------------
+# DISTINCT ORDERS
+# -----------------------------
+class OrderCounter:
+    """Mergeable distinct-order counts per cube cell.
+
+    When every order falls in a single cell (the usual case: one order, one
+    date, one region, one product) per-cell distinct counts are additive and
+    a query sums them.  Otherwise the sorted ``(cell, order)`` pairs are kept
+    and a query takes the exact union of the selected cells' orders.
+    """
+
+    def __init__(self, shape, per_cell=None, pair_cells=None, pair_orders=None):
+        self.shape = shape
+        self.per_cell = per_cell
+        self.pair_cells = pair_cells
+        self.pair_orders = pair_orders
+
+    @classmethod
+    def from_cells(cls, cell, order_ids, shape):
+        codes, uniques = pd.factorize(order_ids)
+        valid = codes >= 0
+        base = max(len(uniques), 1)
+        pairs = np.unique(cell[valid] * base + codes[valid].astype(np.int64))
+        pair_cells = pairs // base
+        if len(pairs) == len(uniques):
+            size = shape[0] * shape[1] * shape[2]
+            return cls(shape, per_cell=np.bincount(pair_cells, minlength=size).reshape(shape))
+        return cls(shape, pair_cells=pair_cells, pair_orders=pairs % base)
+
+    def merge(self, other, positions, other_positions, shape):
+        """Counts of both cubes regridded to ``shape``, or ``None`` unless both are per cell.
+
+        ``other`` must not share orders with this counter.
+        """
+        if self.per_cell is None or other.per_cell is None:
+            return None
+        per_cell = _regrid(self.per_cell, positions, shape) + _regrid(other.per_cell, other_positions, shape)
+        return OrderCounter(shape, per_cell=per_cell)
+
+    def count(self, view):
+        if self.per_cell is not None:
+            return int(view._cells(self.per_cell).sum())
+        selected = np.zeros(self.shape, dtype=bool)
+        selected[view._dates, view._regions[:, None], view._products] = True
+        hit = selected.reshape(-1)[self.pair_cells]
+        return int(np.unique(self.pair_orders[hit]).size)
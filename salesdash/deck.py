@@ -0,0 +1,209 @@
+"""PDF and PowerPoint reports built from static images of the dashboard figures.
+
+Each figure is rendered to PNG once (kaleido, in parallel) and cached under
+a hash of its JSON and image size, so exporting again with unchanged filters
+only reassembles the documents from cached images.  Reports are built on a
+background thread; the Streamlit script thread only submits the job and
+polls the returned future.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import plotly.io as pio
+from PIL import Image, ImageDraw, ImageFont
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+IMAGE_WIDTH = 1280
+IMAGE_HEIGHT = 720
+IMAGE_SCALE = 2
+CACHE_SIZE = 256
+FORMATS = {
+    "pdf": "application/pdf",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+# 16:9 slides to match the images
+SLIDE_WIDTH = Inches(13.333)
+SLIDE_HEIGHT = Inches(7.5)
+
+
+def figure_key(spec, width=IMAGE_WIDTH, height=IMAGE_HEIGHT, scale=IMAGE_SCALE):
+    """Cache key of a figure's JSON rendered at the given size."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(spec.encode("utf-8"))
+    h.update(f"{width}x{height}@{scale}".encode("ascii"))
+    return h.hexdigest()
+
+
+# -----------------------------
+# IMAGE CACHE
+# -----------------------------
+class ImageCache:
+    """PNG bytes by figure key: an in-memory LRU with an optional disk tier."""
+
+    def __init__(self, directory=None, max_size=CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key):
+        with self._lock:
+            data = self._images.get(key)
+            if data is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return data
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            self._remember(key, data)
+            with self._lock:
+                self.hits += 1
+            return data
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        self._remember(key, data)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._images[key] = data
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_size:
+                self._images.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.hits = self.misses = 0
+
+
+_CACHE = ImageCache()
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="deck")
+
+
+# -----------------------------
+# RENDERING
+# -----------------------------
+def _render(spec, width, height, scale):
+    return pio.to_image(json.loads(spec), format="png", width=width, height=height, scale=scale)
+
+
+def render_images(specs, cache=None, width=IMAGE_WIDTH, height=IMAGE_HEIGHT, scale=IMAGE_SCALE,
+                  max_workers=None):
+    """PNG bytes for ``{title: figure JSON}``, rendering only the uncached ones."""
+    cache = _CACHE if cache is None else cache
+    keys = {title: figure_key(spec, width, height, scale) for title, spec in specs.items()}
+    images = {title: cache.get(key) for title, key in keys.items()}
+    missing = [title for title, data in images.items() if data is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            rendered = pool.map(lambda t: _render(specs[t], width, height, scale), missing)
+            for title, data in zip(missing, rendered):
+                cache.put(keys[title], data)
+                images[title] = data
+    return images
+
+
+# -----------------------------
+# DOCUMENTS
+# -----------------------------
+def build_pptx(images, title=None, logo=None):
+    """A 16:9 deck with an optional title slide and one slide per image.
+
+    ``logo`` is encoded image bytes placed on the title slide.
+    """
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = SLIDE_WIDTH, SLIDE_HEIGHT
+    if title:
+        slide = prs.slides.add_slide(prs.slide_layouts[0])
+        slide.shapes.title.text = title
+        if logo is not None:
+            size = Inches(1.5)
+            slide.shapes.add_picture(io.BytesIO(logo), SLIDE_WIDTH - size - Inches(0.4), Inches(0.4), height=size)
+    margin = Inches(0.4)
+    header = Inches(0.9)
+    for caption, data in images.items():
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        box = slide.shapes.add_textbox(margin, Inches(0.2), SLIDE_WIDTH - 2 * margin, header - Inches(0.2))
+        box.text_frame.text = caption
+        box.text_frame.paragraphs[0].runs[0].font.size = Pt(28)
+        # Fit the 16:9 image below the caption, centred horizontally.
+        height = SLIDE_HEIGHT - header - margin
+        width = int(height * IMAGE_WIDTH / IMAGE_HEIGHT)
+        slide.shapes.add_picture(io.BytesIO(data), (SLIDE_WIDTH - width) // 2, header, width, height)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def _title_page(title, logo, size):
+    """A white page laid out like the PPTX title slide: ``title`` centred, ``logo`` top right."""
+    page = Image.new("RGB", size, "white")
+    width, height = size
+    font = ImageFont.load_default(size=height // 12)
+    ImageDraw.Draw(page).text((width // 2, height // 2), title, fill="black", font=font, anchor="mm")
+    if logo is not None:
+        with Image.open(io.BytesIO(logo)) as image:
+            mark = image.convert("RGBA")
+        # Same proportions as the slide: 1.5in high, 0.4in from the corner of 7.5in
+        mark.thumbnail((width, height // 5), Image.LANCZOS)
+        margin = height * 4 // 75
+        page.paste(mark, (width - mark.width - margin, margin), mark)
+    return page
+
+
+def build_pdf(images, title=None, logo=None):
+    """An optional title page and one PDF page per image, in order.
+
+    ``logo`` is encoded image bytes placed on the title page.
+    """
+    pages = [Image.open(io.BytesIO(data)).convert("RGB") for data in images.values()]
+    if title:
+        size = pages[0].size if pages else (IMAGE_WIDTH * IMAGE_SCALE, IMAGE_HEIGHT * IMAGE_SCALE)
+        pages.insert(0, _title_page(title, logo, size))
+    buffer = io.BytesIO()
+    if pages:
+        pages[0].save(buffer, format="PDF", save_all=True, append_images=pages[1:], resolution=IMAGE_SCALE * 96)
+    return buffer.getvalue()
+
+
+def build_report(specs, formats=tuple(FORMATS), title=None, logo=None, cache=None, **render_options):
+    """``{format: bytes}`` for the requested formats, sharing one set of images."""
+    images = render_images(specs, cache, **render_options)
+    builders = {"pdf": lambda: build_pdf(images, title, logo), "pptx": lambda: build_pptx(images, title, logo)}
+    return {fmt: builders[fmt]() for fmt in formats}
+
+
+def submit_report(figures, formats=tuple(FORMATS), title=None, logo=None, cache=None, **render_options):
+    """Start building a report in the background and return its ``Future``.
+
+    Figures are serialised here, on the caller's thread, so the caller may
+    keep changing them while the report is built.
+    """
+    specs = {caption: fig.to_json() for caption, fig in figures.items()}
+    return _EXECUTOR.submit(build_report, specs, tuple(formats), title, logo, cache, **render_options)
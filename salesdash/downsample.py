@@ -0,0 +1,79 @@
+"""Point-budget downsampling for line charts.
+
+Both methods return row positions rather than new values, so callers can
+gather hover columns from the same rows.  ``lttb`` (Largest-Triangle-Three-
+Buckets) keeps the visual shape of a series; ``minmax`` keeps every bucket's
+extremes and so never drops a peak.
+"""
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+DEFAULT_POINTS = 1200
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+# -----------------------------
+# METHODS
+# -----------------------------
+def lttb(x, y, n_out=DEFAULT_POINTS):
+    """Positions of the ``n_out`` points chosen by Largest-Triangle-Three-Buckets."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+
+    # First and last points are fixed; the rest fall into n_out - 2 buckets.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        px, py = x[prev], y[prev]
+        area = np.abs((px - cx) * (y[lo:hi] - py) - (px - x[lo:hi]) * (cy - py))
+        prev = lo + int(area.argmax())
+        keep[i + 1] = prev
+    return keep
+
+
+def minmax(x, y, n_out=DEFAULT_POINTS):
+    """Positions of each bucket's minimum and maximum, in x order."""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    n_buckets = n_out // 2
+    bucket = (np.arange(n) * n_buckets) // n
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    order = np.lexsort((y, bucket))
+    first = order[starts]
+    last = order[np.r_[starts[1:], n] - 1]
+    return np.unique(np.concatenate([[0, n - 1], first, last]))
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def downsample(df, x, y, n_out=DEFAULT_POINTS, method="lttb", by=None):
+    """Rows of ``df`` (sorted by ``x``) kept after downsampling ``y``.
+
+    With ``by`` each group is reduced to its own ``n_out`` budget.
+    """
+    pick = METHODS[method]
+    if by is None:
+        return df.iloc[pick(df[x].to_numpy(), df[y].to_numpy(), n_out)]
+    parts = [group.iloc[pick(group[x].to_numpy(), group[y].to_numpy(), n_out)]
+             for _, group in df.groupby(by, observed=True, sort=False)]
+    return pd.concat(parts) if parts else df.iloc[:0]
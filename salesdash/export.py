@@ -0,0 +1,36 @@
+"""In-memory ZIP export of the dashboard figures.
+
+Figures are rendered to HTML concurrently and written straight into a ZIP
+held in memory, so nothing touches the working directory and concurrent
+users cannot clobber each other's files.  The HTML pages load plotly.js from
+a single ``plotly.min.js`` stored once in the archive instead of each page
+embedding its own copy.
+"""
+
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+PLOTLY_JS_NAME = "plotly.min.js"
+
+
+def _render(fig):
+    return pio.to_html(fig, include_plotlyjs=PLOTLY_JS_NAME, full_html=True)
+
+
+def export_zip(figures, max_workers=None):
+    """Render ``{filename: figure}`` into a ZIP archive and return its bytes."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr(PLOTLY_JS_NAME, get_plotlyjs())
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_render, fig): name for name, fig in figures.items()}
+            for future in as_completed(futures):
+                zipf.writestr(futures[future], future.result())
+    return buffer.getvalue()
@@ -0,0 +1,182 @@
+"""Memoized Holt-Winters forecasts for the monthly sales series.
+
+Fitted models are cached by a hash of the series and the model spec, so a
+rerun that leaves the filters alone never refits.  When a series differs
+from an earlier fit only in its latest month (a revised or a new month), the
+optimizer is started from the earlier parameters instead of a grid search.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+from salesdash.schema import month_start
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+DEFAULT_SPEC = {"trend": "add", "seasonal": None, "seasonal_periods": None, "damped_trend": False}
+CACHE_SIZE = 128
+
+
+def _spec(**overrides):
+    spec = dict(DEFAULT_SPEC)
+    spec.update(overrides)
+    return tuple(sorted(spec.items()))
+
+
+def _digest(values, spec):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    h.update(repr(spec).encode())
+    return h.hexdigest()
+
+
+# -----------------------------
+# FITTING
+# -----------------------------
+def _start_params(params, spec):
+    """Order fitted parameters the way ``ExponentialSmoothing.fit`` expects."""
+    spec = dict(spec)
+    start = [params["smoothing_level"]]
+    if spec["trend"]:
+        start.append(params["smoothing_trend"])
+    if spec["seasonal"]:
+        start.append(params["smoothing_seasonal"])
+    start.append(params["initial_level"])
+    if spec["trend"]:
+        start.append(params["initial_trend"])
+    if spec["damped_trend"]:
+        start.append(params["damping_trend"])
+    if spec["seasonal"]:
+        start.extend(params["initial_seasons"])
+    return np.asarray(start, dtype=np.float64)
+
+
+def _fit(values, spec, start_params=None):
+    model = ExponentialSmoothing(np.asarray(values, dtype=np.float64), **dict(spec))
+    if start_params is None:
+        return model.fit()
+    return model.fit(start_params=start_params, use_brute=False)
+
+
+class ForecastCache:
+    """LRU cache of fitted models with warm-start bookkeeping."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._fits = OrderedDict()
+        # digest of (series without its last point) -> fitted params
+        self._warm = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, table, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.maxsize:
+            table.popitem(last=False)
+
+    def lookup(self, values, spec):
+        key = _digest(values, spec)
+        with self._lock:
+            result = self._fits.get(key)
+            if result is not None:
+                self._fits.move_to_end(key)
+                self.hits += 1
+                return key, result, None
+            self.misses += 1
+            return key, None, self._warm.get(_digest(values[:-1], spec))
+
+    def store(self, key, values, spec, result):
+        with self._lock:
+            self._remember(self._fits, key, result)
+            # A later series that only revises the last month, or appends one,
+            # shares one of these prefixes with this fit.
+            self._remember(self._warm, _digest(values[:-1], spec), result.params)
+            self._remember(self._warm, _digest(values, spec), result.params)
+
+    def fit(self, values, **spec):
+        values = np.asarray(values, dtype=np.float64)
+        spec = _spec(**spec)
+        key, result, warm = self.lookup(values, spec)
+        if result is None:
+            start = _start_params(warm, spec) if warm is not None else None
+            result = _fit(values, spec, start)
+            self.store(key, values, spec, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._fits.clear()
+            self._warm.clear()
+            self.hits = self.misses = 0
+
+
+_CACHE = ForecastCache()
+
+
+# -----------------------------
+# PUBLIC API
+# -----------------------------
+def fit_model(series, cache=None, **spec):
+    """Return the (cached) fitted Holt-Winters results for ``series``."""
+    return (cache or _CACHE).fit(series, **spec)
+
+
+def forecast_series(series, periods=6, cache=None, **spec):
+    """Forecast ``periods`` steps ahead of ``series`` as a NumPy array."""
+    return np.asarray(fit_model(series, cache, **spec).forecast(periods))
+
+
+def _fit_job(values, spec, start_params, periods):
+    result = _fit(values, spec, start_params)
+    return result, np.asarray(result.forecast(periods))
+
+
+def forecast_segments(monthly, by, periods=6, max_workers=None, cache=None, **spec):
+    """Forecast one monthly ``TotalPrice`` series per value of ``by``.
+
+    ``monthly`` has one row per (month, segment) with ``Month``, ``by`` and
+    ``TotalPrice`` columns.  Segments already in the cache are served from it;
+    the rest are fitted in parallel in a process pool.  Returns a frame with
+    ``by``, ``Month`` and ``Forecast`` columns.
+    """
+    cache = cache or _CACHE
+    spec = _spec(**spec)
+    wide = monthly.pivot_table(index="Month", columns=by, values="TotalPrice",
+                               aggfunc="sum", observed=True).sort_index()
+    months = month_start(wide.index)
+    future = pd.date_range(start=months.max() + pd.offsets.MonthBegin(1), periods=periods, freq="MS")
+
+    forecasts, jobs = {}, {}
+    for segment in wide.columns:
+        values = wide[segment].fillna(0.0).to_numpy(dtype=np.float64)
+        key, result, warm = cache.lookup(values, spec)
+        if result is not None:
+            forecasts[segment] = np.asarray(result.forecast(periods))
+        else:
+            start = _start_params(warm, spec) if warm is not None else None
+            jobs[segment] = (key, values, start)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {segment: pool.submit(_fit_job, values, spec, start, periods)
+                       for segment, (key, values, start) in jobs.items()}
+            for segment, future_result in futures.items():
+                result, values_out = future_result.result()
+                key, values, _ = jobs[segment]
+                cache.store(key, values, spec, result)
+                forecasts[segment] = values_out
+
+    return pd.concat(
+        [pd.DataFrame({by: segment, "Month": future, "Forecast": forecasts[segment]})
+         for segment in wide.columns],
+        ignore_index=True,
+    )
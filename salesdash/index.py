@@ -0,0 +1,206 @@
+"""Date-sorted row index for the sidebar filters.
+
+The loader hands over frames already sorted by ``Date``.  On top of that the
+index keeps, for every (Region, Product) pair, the positions of its rows in
+date order, so a filter becomes one ``searchsorted`` per selected pair and a
+gather of the matching slices instead of four full-length boolean masks.
+Callers keep the resulting row positions (8 bytes per matching row) and
+gather only the columns a chart reads, so a session never holds a copy of
+the shared frame.
+
+The same layout carries running totals per pair, which answer "sales in a
+date window" with two lookups per pair and no intermediate frame.  Rows
+appended after the last date are slotted into their pairs by
+:meth:`SalesIndex.extend` without sorting the existing rows again.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+PREFIX_MEASURES = ("TotalPrice", "Quantity")
+
+# mode -> label shown next to the KPI delta
+COMPARISON_MODES = {
+    "all_before": "all earlier sales",
+    "prior": "previous period",
+    "yoy": "same period last year",
+}
+
+
+# -----------------------------
+# INDEX
+# -----------------------------
+def _running_total(values, start=0.0):
+    """``start`` followed by the running sums of ``values`` from it."""
+    return np.cumsum(np.concatenate([[start], values]))
+
+
+class SalesIndex:
+    """Date-sorted rows split into per-(Region, Product) lists for window queries.
+
+    ``frame`` is sorted by ``Date``.  Group ``g`` (region code times the
+    number of products plus product code) holds ``group_rows[g]``, its row
+    positions in date order, ``group_dates[g]``, their dates, and per measure
+    ``prefix[m][g]``, running totals with a leading zero, so the rows
+    ``[lo, hi)`` of a group sum to ``prefix[m][g][hi] - prefix[m][g][lo]``.
+    """
+
+    def __init__(self, df, measures=PREFIX_MEASURES):
+        if not df["Date"].is_monotonic_increasing:
+            df = df.sort_values("Date", kind="stable", ignore_index=True)
+        self.frame = df
+        self.dates = df["Date"].to_numpy()
+
+        regions = pd.Categorical(df["Region"])
+        products = pd.Categorical(df["Product"])
+        self.regions = pd.Index(regions.categories)
+        self.products = pd.Index(products.categories)
+        n_groups = len(self.regions) * len(self.products)
+        group = regions.codes.astype(np.int64) * len(self.products) + products.codes
+        group[(regions.codes < 0) | (products.codes < 0)] = n_groups
+
+        # Stable sort keeps each group's rows in date order.
+        order = np.argsort(group, kind="stable")
+        counts = np.bincount(group[group < n_groups], minlength=n_groups)
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        self._complete = bounds[-1] == len(df)
+        self.group_rows = [order[bounds[g]:bounds[g + 1]] for g in range(n_groups)]
+        self.group_dates = [self.dates[rows] for rows in self.group_rows]
+        self.prefix = {}
+        for m in measures:
+            values = df[m].to_numpy(dtype=np.float64)
+            self.prefix[m] = [_running_total(values[rows]) for rows in self.group_rows]
+
+    def extend(self, df, rows):
+        """Index of ``df``, this index's frame with ``rows`` appended, or ``None``.
+
+        Only the groups the new rows fall in are extended; the others are
+        shared with this index.  ``None`` means ``rows`` bring a region or
+        product, lack one, or start before the last indexed date; build a new
+        index then.
+        """
+        n = len(self.frame)
+        if not self._complete or len(df) != n + len(rows):
+            return None
+        if n and len(rows) and rows["Date"].iloc[0] < self.dates[-1]:
+            return None
+        new = df.iloc[n:]
+        r = self.regions.get_indexer(new["Region"])
+        p = self.products.get_indexer(new["Product"])
+        if (r < 0).any() or (p < 0).any():
+            return None
+        group = r.astype(np.int64) * len(self.products) + p
+        order = np.argsort(group, kind="stable")
+        touched, starts = np.unique(group[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        dates = new["Date"].to_numpy()
+        values = {m: new[m].to_numpy(dtype=np.float64) for m in self.prefix}
+
+        index = copy.copy(self)
+        index.frame = df
+        index.dates = df["Date"].to_numpy()
+        index.group_rows = list(self.group_rows)
+        index.group_dates = list(self.group_dates)
+        index.prefix = {m: list(prefix) for m, prefix in self.prefix.items()}
+        for g, lo, hi in zip(touched, bounds[:-1], bounds[1:]):
+            picked = order[lo:hi]
+            index.group_rows[g] = np.concatenate([self.group_rows[g], n + picked])
+            index.group_dates[g] = np.concatenate([self.group_dates[g], dates[picked]])
+            for m, prefix in self.prefix.items():
+                index.prefix[m][g] = np.concatenate([prefix[g][:-1], _running_total(values[m][picked], prefix[g][-1])])
+        return index
+
+    def _positions(self, labels, axis):
+        if labels is None:
+            return np.arange(len(axis))
+        pos = axis.get_indexer(list(labels))
+        return np.unique(pos[pos >= 0])
+
+    def groups(self, regions=None, products=None):
+        """Flat group ids for the selected (Region, Product) pairs."""
+        r = self._positions(regions, self.regions)
+        p = self._positions(products, self.products)
+        return (r[:, None] * len(self.products) + p).ravel()
+
+    def _bound(self, values, date, side):
+        return int(values.searchsorted(pd.Timestamp(date).to_datetime64(), side=side))
+
+    def _span(self, values, start, end, before):
+        lo = 0 if start is None else self._bound(values, start, "left")
+        hi = len(values)
+        if end is not None:
+            hi = min(hi, self._bound(values, end, "right"))
+        if before is not None:
+            hi = min(hi, self._bound(values, before, "left"))
+        return lo, max(lo, hi)
+
+    def _group_spans(self, groups, start, end, before):
+        for g in groups:
+            lo, hi = self._span(self.group_dates[g], start, end, before)
+            yield g, lo, hi
+
+    def rows(self, regions=None, products=None, start=None, end=None, before=None):
+        """Row positions, in date order, matching the filters.
+
+        ``start``/``end`` are inclusive; ``before`` is an exclusive upper bound.
+        """
+        groups = self.groups(regions, products)
+        if self._complete and len(groups) == len(self.regions) * len(self.products):
+            lo, hi = self._span(self.dates, start, end, before)
+            return np.arange(lo, hi)
+
+        parts = [self.group_rows[g][lo:hi]
+                 for g, lo, hi in self._group_spans(groups, start, end, before) if hi > lo]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+    def filter(self, regions=None, products=None, start=None, end=None, before=None):
+        return self.frame.take(self.rows(regions, products, start, end, before))
+
+    def columns(self, names, rows):
+        """The given columns at the row positions returned by :meth:`rows`."""
+        return self.frame[list(names)].take(rows)
+
+    def total(self, measure="TotalPrice", regions=None, products=None,
+              start=None, end=None, before=None):
+        """Sum of ``measure`` over the filters, read from the prefix sums."""
+        prefix = self.prefix[measure]
+        groups = self.groups(regions, products)
+        return float(sum(prefix[g][hi] - prefix[g][lo]
+                         for g, lo, hi in self._group_spans(groups, start, end, before)))
+
+
+# -----------------------------
+# COMPARISON PERIODS
+# -----------------------------
+def comparison_range(start, end, mode="all_before"):
+    """Half-open ``(start, before)`` window to compare ``[start, end]`` against.
+
+    ``all_before`` is everything earlier than ``start``; ``prior`` is the
+    window of equal length ending just before ``start``; ``yoy`` is the same
+    window one year earlier.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if mode == "all_before":
+        return None, start
+    if mode == "prior":
+        length = end - start + pd.Timedelta(days=1)
+        return start - length, start
+    if mode == "yoy":
+        year = pd.DateOffset(years=1)
+        return start - year, end - year + pd.Timedelta(days=1)
+    raise ValueError(f"Unknown comparison mode: {mode!r}")
+
+
+def period_delta(index, regions, products, start, end, mode="all_before", measure="TotalPrice"):
+    """Percent change of ``measure`` in ``[start, end]`` versus the comparison window."""
+    current = index.total(measure, regions, products, start=start, end=end)
+    lo, hi = comparison_range(start, end, mode)
+    previous = index.total(measure, regions, products, start=lo, before=hi)
+    return ((current - previous) / previous * 100) if previous != 0 else 0
@@ -0,0 +1,166 @@
+"""Out-of-core ingestion of sales exports into month-partitioned Parquet.
+
+Rows are streamed from the workbook (openpyxl read-only mode) or a CSV in
+fixed-size chunks, typed to one fixed schema and appended to a Hive-style
+dataset (``<root>/Month=YYYY-MM/part-*.parquet``).  Readers then load only the
+partitions, columns and rows a view needs.
+
+    python -m salesdash.ingest Product-Sales-Region.xlsx sales_parquet
+"""
+
+import argparse
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from salesdash.schema import DATE_COLUMNS, NUMERIC_DTYPES, apply_schema, month_label
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+CHUNK_ROWS = 100_000
+DICTIONARY_COLUMNS = ("Region", "Product")
+
+
+# -----------------------------
+# READING
+# -----------------------------
+def _xlsx_chunks(path, chunksize):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(c).strip() for c in next(rows)]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def iter_chunks(path, chunksize=CHUNK_ROWS):
+    """Yield raw DataFrames of at most ``chunksize`` rows from an xlsx or CSV file."""
+    if path.lower().endswith(".csv"):
+        yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        yield from _xlsx_chunks(path, chunksize)
+
+
+def normalize_chunk(df):
+    """Type one chunk with :func:`~salesdash.schema.apply_schema` for storage.
+
+    Two things differ from the in-memory frame: text columns are plain
+    strings, since each chunk's categories differ and Parquet and SQL encode
+    text themselves, and ``Month`` is the ``YYYY-MM`` partition directory name.
+    """
+    df = apply_schema(df.copy())
+    for col in df.columns:
+        if col not in NUMERIC_DTYPES and col not in DATE_COLUMNS and col != "Month":
+            df[col] = df[col].astype("string")
+    df["Month"] = month_label(df["Month"])
+    return df
+
+
+# -----------------------------
+# WRITING
+# -----------------------------
+def write_partitions(chunks, root, prefix="part"):
+    """Append normalised chunks to the month-partitioned dataset at ``root``.
+
+    Returns the number of rows written.
+    """
+    os.makedirs(root, exist_ok=True)
+    total = 0
+    for i, chunk in enumerate(chunks):
+        chunk = normalize_chunk(chunk)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        pq.write_to_dataset(
+            table, root, partition_cols=["Month"],
+            basename_template=f"{prefix}-{i:05d}-{{i}}.parquet",
+            use_dictionary=list(DICTIONARY_COLUMNS),
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        total += len(chunk)
+    return total
+
+
+def ingest(source, root, chunksize=CHUNK_ROWS):
+    """Stream ``source`` into a partitioned dataset at ``root``."""
+    prefix = os.path.splitext(os.path.basename(source))[0].replace(" ", "_")
+    return write_partitions(iter_chunks(source, chunksize), root, prefix=prefix)
+
+
+# -----------------------------
+# LOADING
+# -----------------------------
+def partition_filters(regions=None, products=None, start=None, end=None, before=None):
+    """Translate sidebar filters into pyarrow ``filters`` for predicate pushdown.
+
+    ``start``/``end`` are inclusive and ``before`` is an exclusive upper bound.
+    Month bounds prune whole partitions before any file is opened.
+    """
+    filters = []
+    if regions is not None:
+        filters.append(("Region", "in", list(regions)))
+    if products is not None:
+        filters.append(("Product", "in", list(products)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        filters += [("Month", ">=", start.strftime("%Y-%m")), ("Date", ">=", start)]
+    if end is not None:
+        end = pd.Timestamp(end)
+        filters += [("Month", "<=", end.strftime("%Y-%m")), ("Date", "<=", end)]
+    if before is not None:
+        before = pd.Timestamp(before)
+        filters += [("Month", "<=", before.strftime("%Y-%m")), ("Date", "<", before)]
+    return filters or None
+
+
+def read_partitions(root, columns=None, regions=None, products=None, start=None, end=None):
+    """Load the rows and columns of the dataset matching the filters.
+
+    The frame comes back in the loader's shape: sorted by ``Date`` and typed
+    by :func:`salesdash.schema.apply_schema`.
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ["Date"]))
+    partitioning = ds.partitioning(pa.schema([("Month", pa.string())]), flavor="hive")
+    if (regions is not None and not len(regions)) or (products is not None and not len(products)):
+        # An empty "in" list has no type to bind to; nothing can match anyway.
+        table = ds.dataset(root, format="parquet", partitioning=partitioning).schema.empty_table()
+        df = (table if columns is None else table.select(columns)).to_pandas()
+    else:
+        df = pd.read_parquet(
+            root, columns=columns, filters=partition_filters(regions, products, start, end),
+            partitioning=partitioning,
+        )
+    if "Month" in df.columns:
+        df = df.drop(columns="Month")
+    df = apply_schema(df)
+    return df.sort_values("Date", kind="stable", ignore_index=True)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a sales export into month-partitioned Parquet.")
+    parser.add_argument("source", help="xlsx or csv file")
+    parser.add_argument("root", help="output dataset directory")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    rows = ingest(args.source, args.root, args.chunksize)
+    print(f"Wrote {rows:,} rows to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Cached, columnar loading of the sales workbook.
+
+The first load of a workbook parses it with openpyxl, normalises the columns
+and writes a typed Parquet copy next to it.  Later loads read the Parquet copy
+and, within one process, return the same DataFrame without touching disk, so
+every Streamlit rerun and every session share one parsed frame.  A
+:class:`~salesdash.store.SalesStore` is read in full once; after an append
+only the new version's files are read and added to the frame.
+"""
+
+import hashlib
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from salesdash.schema import apply_schema, csv_dtypes
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+DEFAULT_SOURCE = "Product-Sales-Region.xlsx"
+CACHE_DIRNAME = ".sales_cache"
+# Bump when prepare_frame changes so stale Parquet copies are not reused.
+CACHE_VERSION = 4
+_HASH_CHUNK = 1 << 20
+
+# path -> ((mtime_ns, size), digest, DataFrame)
+_MEMO = {}
+# store path -> (from version, to version, rows appended in between)
+_APPENDED = {}
+_LOCK = threading.Lock()
+
+
+# -----------------------------
+# FINGERPRINTING
+# -----------------------------
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _store_stamp(path):
+    from salesdash.store import SalesStore
+
+    return ("store", SalesStore(path).version)
+
+
+def source_fingerprint(path=DEFAULT_SOURCE):
+    """Return ``(mtime_ns, size, digest)`` for ``path``.
+
+    The content digest is only recomputed when the mtime or size changes.
+    For a :class:`~salesdash.store.SalesStore` directory the store version
+    stands in for all three.
+    """
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        stamp = _store_stamp(path)
+        return stamp + (f"v{stamp[1]}",)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    entry = _MEMO.get(path)
+    if entry is not None and entry[0] == stamp:
+        return stamp + (entry[1],)
+    return stamp + (_file_digest(path),)
+
+
+def cache_path(path, digest):
+    path = os.path.abspath(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), CACHE_DIRNAME, f"{stem}-{digest}-v{CACHE_VERSION}.parquet")
+
+
+# -----------------------------
+# NORMALISATION
+# -----------------------------
+def prepare_frame(df):
+    """Apply the shared schema (see :mod:`salesdash.schema`) to a raw frame.
+
+    Rows come back sorted by ``Date`` so date ranges are contiguous slices.
+    """
+    return apply_schema(df).sort_values("Date", kind="stable", ignore_index=True)
+
+
+def _read_source(path):
+    if path.lower().endswith(".csv"):
+        return pd.read_csv(path, dtype=csv_dtypes())
+    return pd.read_excel(path)
+
+
+def extend_frame(df, rows):
+    """``df`` with ``rows`` appended, keeping its categorical columns and date order.
+
+    Rows dated on or after the last date go at the end, so existing row
+    positions stay valid; otherwise the result is sorted again.
+    """
+    if not len(rows):
+        return df
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            columns[col] = union_categoricals([df[col], rows[col]], sort_categories=True)
+        else:
+            columns[col] = pd.concat([df[col], rows[col]], ignore_index=True)
+    out = pd.DataFrame(columns)
+    if len(df) and rows["Date"].iloc[0] < df["Date"].iloc[-1]:
+        out = out.sort_values("Date", kind="stable", ignore_index=True)
+    return out
+
+
+def _write_cache(df, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, target)
+
+
+# -----------------------------
+# PUBLIC API
+# -----------------------------
+def load_sales(path=DEFAULT_SOURCE):
+    """Load the sales workbook at ``path`` as a normalised DataFrame.
+
+    Columns are typed by :func:`salesdash.schema.apply_schema`: categorical
+    dimensions, 32-bit ``Quantity`` and ``Discount`` and an ordinal ``Month``.
+
+    ``path`` may also be a :class:`~salesdash.store.SalesStore` directory, in
+    which case the frame is reloaded whenever the store version changes.
+
+    The returned frame is shared between callers in the same process and must
+    be treated as read-only; take a copy before adding or changing columns.
+    """
+    path = os.path.abspath(path)
+    with _LOCK:
+        if os.path.isdir(path):
+            return _load_store(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = _MEMO.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[2]
+
+        digest = _file_digest(path)
+        target = cache_path(path, digest)
+        if os.path.exists(target):
+            df = pd.read_parquet(target)
+        else:
+            df = prepare_frame(_read_source(path))
+            _write_cache(df, target)
+
+        _MEMO[path] = (stamp, digest, df)
+        return df
+
+
+def _load_store(path):
+    from salesdash.store import SalesStore
+
+    stamp = _store_stamp(path)
+    entry = _MEMO.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[2]
+    store = SalesStore(path)
+    if entry is not None and entry[0][1] < stamp[1]:
+        rows = store.load_since(entry[0][1], stamp[1])
+        df = extend_frame(entry[2], rows)
+        _APPENDED[path] = (entry[0][1], stamp[1], rows)
+    else:
+        df = store.load_since(0, stamp[1])
+    _MEMO[path] = (stamp, f"v{stamp[1]}", df)
+    return df
+
+
+def load_store(path, since=None):
+    """``(fingerprint, frame, appended)`` for the store at ``path``.
+
+    ``frame`` is what :func:`load_sales` returns and ``fingerprint`` matches
+    :func:`source_fingerprint`.  ``appended`` holds the rows added after
+    version ``since`` (``None`` when ``since`` is not given or not older).
+    """
+    from salesdash.store import SalesStore
+
+    path = os.path.abspath(path)
+    with _LOCK:
+        df = _load_store(path)
+        stamp = _MEMO[path][0]
+        appended = None
+        if since is not None and since < stamp[1]:
+            last = _APPENDED.get(path)
+            if last is not None and last[:2] == (since, stamp[1]):
+                appended = last[2]
+            else:
+                appended = SalesStore(path).load_since(since, stamp[1])
+    return stamp + (f"v{stamp[1]}",), df, appended
+
+
+def clear_memo():
+    """Drop the in-process copies; the on-disk Parquet caches are kept."""
+    with _LOCK:
+        _MEMO.clear()
+        _APPENDED.clear()
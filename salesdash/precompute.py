@@ -0,0 +1,131 @@
+"""Background computation of the dashboard tabs.
+
+``Dashboard Integration.py`` runs its tabs lazily: only the open tab renders
+on a rerun.  Each tab's data and figures are computed by a
+:class:`TabScheduler`, shared by every session, which runs them in thread
+pools keyed by the filter state.  The open tab's jobs run on a pool of their
+own and are waited for, so they never queue behind another session's
+precomputation.  The other tabs are queued on the background pool, so a
+later tab switch finds its figures already built.  When a session's filters
+change, its queued jobs for the old state are cancelled unless another
+session still wants them.  Jobs that are already running finish and stay
+available in case the old state comes back.  Given a
+:class:`~salesdash.results.ResultCache`, finished results also outlive the
+job table and are shared with later reruns for the same state.
+
+Threads rather than processes: jobs query the shared in-process data source,
+and pandas, Arrow and SQLite release the GIL for the heavy parts.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from salesdash.results import filter_key
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+TAB_WORKERS = 4
+OPEN_TAB_WORKERS = 2
+MAX_JOBS = 64
+
+
+class TabScheduler:
+    """Open-tab and background thread pools of tab jobs, deduplicated by ``(name, key)``.
+
+    ``hits`` counts results that were ready when first asked for, and
+    ``misses`` counts results that had to be waited for.  Jobs check
+    ``results`` (a :class:`~salesdash.results.ResultCache`) before computing.
+    """
+
+    def __init__(self, max_workers=TAB_WORKERS, max_jobs=MAX_JOBS, results=None, open_workers=OPEN_TAB_WORKERS):
+        self.max_jobs = max_jobs
+        self.results = results
+        self._open = ThreadPoolExecutor(max_workers=open_workers, thread_name_prefix="salesdash-open-tab")
+        self._background = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="salesdash-tab")
+        # (name, key) -> (future, on the open-tab pool)
+        self._jobs = OrderedDict()
+        # (name, key) -> sessions that scheduled it
+        self._owners = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, name, key, fn, *args, urgent=False, owner=None):
+        """Future for job ``(name, key)``, queuing ``fn(*args)`` unless it is already known.
+
+        ``urgent`` jobs run on the open-tab pool; one still queued on the
+        background pool is moved there.  ``owner`` (a session id) is recorded
+        for :meth:`schedule`.
+        """
+        job = (name, key)
+        with self._lock:
+            future, on_open = self._jobs.get(job, (None, False))
+            if future is not None and urgent and not on_open and future.cancel():
+                future = None
+            if future is None or future.cancelled():
+                pool = self._open if urgent else self._background
+                future, on_open = pool.submit(self._run, name, key, fn, args), urgent
+                self._jobs[job] = (future, on_open)
+            self._jobs.move_to_end(job)
+            if owner is not None:
+                self._owners.setdefault(job, set()).add(owner)
+            # Forget the oldest jobs; anyone still holding their futures keeps them.
+            while len(self._jobs) > self.max_jobs:
+                old, _ = self._jobs.popitem(last=False)
+                self._owners.pop(old, None)
+            return future
+
+    def _run(self, name, key, fn, args):
+        if self.results is None:
+            return fn(*args)
+        return self.results.get_or_compute(filter_key(name, key), lambda: fn(*args))
+
+    def result(self, name, key, fn, *args):
+        """Block until job ``(name, key)`` is done and return its result."""
+        while True:
+            future = self.submit(name, key, fn, *args, urgent=True)
+            with self._lock:
+                if future.done():
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            try:
+                return future.result()
+            except CancelledError:
+                # Cancelled while queued, or moved to the open-tab pool; ask again.
+                continue
+            except Exception:
+                with self._lock:
+                    if self._jobs.get((name, key), (None,))[0] is future:
+                        del self._jobs[(name, key)]
+                raise
+
+    def schedule(self, jobs, previous=(), urgent=(), owner=None):
+        """Queue ``jobs`` (``{name: (key, fn, args)}``) for session ``owner``.
+
+        Jobs named in ``urgent`` (the open tab's) go to the open-tab pool.
+        Queued jobs in ``previous`` that are not in ``jobs`` are cancelled
+        once no other session has scheduled them.  Returns the job ids to
+        pass as ``previous`` on the next rerun.
+        """
+        wanted = set()
+        for name, (key, fn, args) in jobs.items():
+            self.submit(name, key, fn, *args, urgent=name in urgent, owner=owner)
+            wanted.add((name, key))
+        with self._lock:
+            for job in set(previous) - wanted:
+                owners = self._owners.get(job, set())
+                owners.discard(owner)
+                if owners:
+                    continue
+                future = self._jobs.get(job, (None,))[0]
+                if future is not None and future.cancel():
+                    del self._jobs[job]
+                    self._owners.pop(job, None)
+        return wanted
+
+    def shutdown(self):
+        self._open.shutdown(wait=False, cancel_futures=True)
+        self._background.shutdown(wait=False, cancel_futures=True)
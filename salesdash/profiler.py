@@ -0,0 +1,217 @@
+"""Per-rerun stage timings for the Streamlit apps.
+
+Each script run creates a :class:`RerunProfile` and wraps its stages in
+``profile.stage(...)``.  A stage records wall time, rows processed, the
+change in process RSS and, when given a cache with ``hits``/``misses``
+counters, the hits and misses it caused.  The overhead is a
+``perf_counter`` call and one read of ``/proc/self/statm`` per stage, so
+profiling stays on in production.
+
+``profile.finish()`` folds the run into the process-wide
+:data:`REGISTRY`, logs it as one JSON line on the ``salesdash.profiler``
+logger (INFO) and, if ``$SALES_PROFILE_PROM`` names a file, rewrites it in
+the Prometheus text format for a node-exporter textfile collector.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+PROMETHEUS_ENV = "SALES_PROFILE_PROM"
+METRIC_PREFIX = "salesdash_stage"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def _rss():
+    """Resident set size in bytes, or ``None`` where ``/proc`` is unavailable."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+# -----------------------------
+# ONE RERUN
+# -----------------------------
+class Stage:
+    """Totals for one named stage; repeated ``stage()`` calls accumulate."""
+
+    __slots__ = ("name", "calls", "seconds", "rows", "rss_delta", "hits", "misses")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = None
+        self.rss_delta = None
+        self.hits = 0
+        self.misses = 0
+
+    def add_rows(self, rows):
+        self.rows = (self.rows or 0) + int(rows)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RerunProfile:
+    """Stages of one script run of ``app``, in the order they first ran."""
+
+    def __init__(self, app):
+        self.app = app
+        self.stages = {}
+        self.total = None
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None, cache=None):
+        """Time the enclosed block as stage ``name``.
+
+        ``rows`` (or ``add_rows`` on the yielded :class:`Stage`) counts rows
+        processed; ``cache`` is any object with ``hits``/``misses`` counters.
+        """
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = Stage(name)
+        counters = (cache.hits, cache.misses) if cache is not None else None
+        rss = _rss()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds += time.perf_counter() - start
+            record.calls += 1
+            if rows is not None:
+                record.add_rows(rows)
+            if rss is not None:
+                record.rss_delta = (record.rss_delta or 0) + _rss() - rss
+            if counters is not None:
+                record.hits += cache.hits - counters[0]
+                record.misses += cache.misses - counters[1]
+
+    def finish(self):
+        """Close the rerun: record it, log it and refresh the Prometheus file."""
+        self.total = time.perf_counter() - self._start
+        REGISTRY.observe(self)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(self.as_dict()))
+        path = os.environ.get(PROMETHEUS_ENV)
+        if path:
+            REGISTRY.write_prometheus(path)
+        return self
+
+    def as_dict(self):
+        return {"app": self.app, "total_seconds": self.total,
+                "stages": [s.as_dict() for s in self.stages.values()]}
+
+    def as_frame(self):
+        frame = pd.DataFrame([s.as_dict() for s in self.stages.values()],
+                             columns=list(Stage.__slots__))
+        frame["ms"] = (frame["seconds"] * 1000).round(1)
+        frame["rss_mb"] = (frame["rss_delta"].astype("float64") / 2 ** 20).round(2)
+        return frame.set_index("name")[["ms", "rows", "hits", "misses", "rss_mb", "calls"]]
+
+
+# -----------------------------
+# PROCESS-WIDE AGGREGATES
+# -----------------------------
+class ProfileRegistry:
+    """Latency histograms and counters per (app, stage) across all reruns."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._runs = {}
+
+    def observe(self, profile):
+        with self._lock:
+            runs = self._runs.setdefault(profile.app, [0, 0.0])
+            runs[0] += 1
+            runs[1] += profile.total or 0.0
+            for stage in profile.stages.values():
+                entry = self._stages.setdefault((profile.app, stage.name), {
+                    "count": 0, "sum": 0.0, "buckets": [0] * len(self.buckets),
+                    "rows": 0, "hits": 0, "misses": 0,
+                })
+                entry["count"] += 1
+                entry["sum"] += stage.seconds
+                for i, bound in enumerate(self.buckets):
+                    if stage.seconds <= bound:
+                        entry["buckets"][i] += 1
+                entry["rows"] += stage.rows or 0
+                entry["hits"] += stage.hits
+                entry["misses"] += stage.misses
+
+    def prometheus_text(self):
+        lines = [
+            f"# HELP {METRIC_PREFIX}_seconds Wall time of a dashboard stage per rerun.",
+            f"# TYPE {METRIC_PREFIX}_seconds histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            runs = sorted(self._runs.items())
+        for (app, stage), entry in stages:
+            labels = f'app="{app}",stage="{stage}"'
+            for bound, count in zip(self.buckets, entry["buckets"]):
+                lines.append(f'{METRIC_PREFIX}_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{METRIC_PREFIX}_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+            lines.append(f"{METRIC_PREFIX}_seconds_sum{{{labels}}} {entry['sum']:.6f}")
+            lines.append(f"{METRIC_PREFIX}_seconds_count{{{labels}}} {entry['count']}")
+        for name, help_text in (("rows", "Rows processed by a stage."),
+                                ("cache_hits", "Cache hits inside a stage."),
+                                ("cache_misses", "Cache misses inside a stage.")):
+            key = name.replace("cache_", "")
+            lines += [f"# HELP {METRIC_PREFIX}_{name}_total {help_text}",
+                      f"# TYPE {METRIC_PREFIX}_{name}_total counter"]
+            for (app, stage), entry in stages:
+                lines.append(f'{METRIC_PREFIX}_{name}_total{{app="{app}",stage="{stage}"}} {entry[key]}')
+        lines += ["# HELP salesdash_reruns_total Script reruns profiled.",
+                  "# TYPE salesdash_reruns_total counter"]
+        lines += [f'salesdash_reruns_total{{app="{app}"}} {count}' for app, (count, _) in runs]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+            self._runs.clear()
+
+
+REGISTRY = ProfileRegistry()
+
+
+# -----------------------------
+# DEBUG PANEL
+# -----------------------------
+def render_panel(profile, container=None):
+    """Show ``profile`` as a table in ``container`` (default: the sidebar)."""
+    import streamlit as st
+
+    container = st.sidebar if container is None else container
+    with container.expander("⏱ Stage timings", expanded=True):
+        st.dataframe(profile.as_frame(), width="stretch")
+        st.caption(f"Rerun total: {profile.total * 1000:.0f} ms")
@@ -0,0 +1,175 @@
+"""Headless batch rendering of the matplotlib/seaborn scripts.
+
+Each analysis script runs unchanged under the Agg backend: ``load_sales``
+hands it the slice being rendered and ``plt.show()`` saves the open figures
+instead of opening a window.  Slices (per region, product or month) fan out
+over a process pool whose workers all receive the one frame loaded by the
+parent, so the workbook is read once per run however many reports are made.
+
+    python -m salesdash.reports reports --by region --by month --format png --format svg
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import runpy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import salesdash.loader
+from salesdash.loader import DEFAULT_SOURCE, load_sales
+from salesdash.schema import month_label
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = (
+    "Seaborn Basics.py",
+    "Statistical Visualizations.py",
+    "Heatmaps & Correlation.py",
+    "Multi-plot Dashboards.py",
+)
+# slice name -> column it splits on ("all" renders the whole dataset once)
+SLICES = {"all": None, "region": "Region", "product": "Product", "month": "Month"}
+FORMATS = ("png", "svg")
+DPI = 100
+
+# The dataset inside a worker process, set once by _init_worker.
+_FRAME = None
+
+
+# -----------------------------
+# SLICING
+# -----------------------------
+def _safe_name(text):
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_") or "unnamed"
+
+
+def slices(df, by):
+    """Yield ``(label, row positions)`` for each value of the ``by`` slice.
+
+    ``all`` yields a single ``("all", None)`` slice covering every row.
+    """
+    column = SLICES[by]
+    if column is None:
+        yield "all", None
+        return
+    for value, positions in sorted(df.groupby(column, observed=True).indices.items()):
+        yield (month_label(value) if column == "Month" else str(value)), positions
+
+
+# -----------------------------
+# RENDERING (worker side)
+# -----------------------------
+def _init_worker(df):
+    global _FRAME
+    _FRAME = df
+
+
+@contextlib.contextmanager
+def _headless(frame, show):
+    """Run a script against ``frame`` with ``plt.show`` replaced by ``show``."""
+    original_load, original_show = salesdash.loader.load_sales, plt.show
+    salesdash.loader.load_sales = lambda *args, **kwargs: frame
+    plt.show = show
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        salesdash.loader.load_sales, plt.show = original_load, original_show
+        plt.close("all")
+
+
+def render_script(script, directory, positions=None, formats=("png",), dpi=DPI):
+    """Render one script for one slice into ``directory``; returns the files written."""
+    frame = _FRAME if positions is None else _FRAME.take(positions)
+    stem = _safe_name(os.path.splitext(os.path.basename(script))[0])
+    os.makedirs(directory, exist_ok=True)
+    written = []
+
+    def save_open_figures(*args, **kwargs):
+        for num in plt.get_fignums():
+            fig = plt.figure(num)
+            index = len(written) // len(formats) + 1
+            for fmt in formats:
+                path = os.path.join(directory, f"{stem}-{index:02d}.{fmt}")
+                fig.savefig(path, format=fmt, dpi=dpi, bbox_inches="tight")
+                written.append(path)
+        plt.close("all")
+
+    matplotlib.rcdefaults()
+    with _headless(frame, save_open_figures):
+        runpy.run_path(os.path.join(SCRIPT_DIR, script), run_name="__main__")
+        # Figures a script builds without calling show() are saved too.
+        save_open_figures()
+    return written
+
+
+# -----------------------------
+# BATCH
+# -----------------------------
+def render_reports(out_dir, source=DEFAULT_SOURCE, scripts=SCRIPTS, by=("all",),
+                   formats=("png",), dpi=DPI, max_workers=None):
+    """Render every script for every requested slice.
+
+    Files land in ``<out_dir>/<slice>/<value>/<script>-NN.<format>``.  Returns
+    ``(written, failed)``: the list of files and a ``{job: error}`` mapping
+    for slices a script could not draw (e.g. too few rows).
+    """
+    df = load_sales(source)
+    jobs = []
+    for name in dict.fromkeys(by):
+        for label, positions in slices(df, name):
+            directory = os.path.join(out_dir, name, _safe_name(label))
+            jobs += [(script, directory, positions) for script in scripts]
+
+    written, failed = [], {}
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(df,)) as pool:
+        futures = {
+            pool.submit(render_script, script, directory, positions, tuple(formats), dpi):
+                f"{os.path.relpath(directory, out_dir)}: {script}"
+            for script, directory, positions in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except Exception as exc:
+                failed[futures[future]] = exc
+    return sorted(written), failed
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the matplotlib/seaborn reports headlessly.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--source", default=DEFAULT_SOURCE)
+    parser.add_argument("--by", action="append", choices=list(SLICES),
+                        help="slice to render (repeatable, default: all)")
+    parser.add_argument("--format", action="append", choices=FORMATS, dest="formats",
+                        help="output format (repeatable, default: png)")
+    parser.add_argument("--script", action="append", choices=SCRIPTS, dest="scripts")
+    parser.add_argument("--dpi", type=int, default=DPI)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    written, failed = render_reports(
+        args.out_dir, args.source, args.scripts or SCRIPTS, args.by or ["all"],
+        args.formats or ["png"], args.dpi, args.workers,
+    )
+    for job, exc in sorted(failed.items()):
+        print(f"FAILED {job}: {exc}")
+    print(f"Wrote {len(written):,} files to {args.out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
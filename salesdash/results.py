@@ -0,0 +1,237 @@
+"""Cross-session cache of dashboard results keyed by filter state.
+
+:func:`filter_key` reduces a dataset version and a filter state to a
+canonical digest.  Selections are order-insensitive, and dates compare equal
+whatever type the widget returned.  :class:`ResultCache` keeps computed
+aggregates and figures under such keys in memory within a byte budget.  It
+evicts the least recently or least frequently used entries, and it can also
+pickle entries to a directory that outlives the process.  The memory tier
+hands back the stored objects themselves, figures included, so callers must
+treat them as read-only.  The disk tier stores Plotly figures as their JSON
+and rebuilds them without revalidation only when an entry is loaded back,
+since they were valid when they were serialized.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.basedatatypes import BaseFigure
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+CACHE_BYTES = 256 * 2 ** 20
+DISK_BYTES = 2 * 2 ** 30
+POLICIES = ("lru", "lfu")
+
+
+# -----------------------------
+# KEYS
+# -----------------------------
+def _canonical(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.date, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, dict):
+        return {"dict": sorted((str(k), _canonical(v)) for k, v in value.items())}
+    if isinstance(value, (set, frozenset)):
+        return {"set": sorted(repr(_canonical(v)) for v in value)}
+    if isinstance(value, (list, tuple, pd.Index, np.ndarray, pd.Series)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+
+def selection(values):
+    """A multiselect value as a key part: its order does not matter."""
+    return None if values is None else frozenset(values)
+
+
+def filter_key(version, *parts):
+    """Hex digest of a dataset ``version`` and filter-state ``parts``."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(_canonical((version,) + parts)).encode("utf-8"))
+    return h.hexdigest()
+
+
+# -----------------------------
+# SIZES AND FIGURES
+# -----------------------------
+class _FigureJSON(str):
+    """A figure stored as its JSON."""
+
+
+def _pack(value):
+    if isinstance(value, BaseFigure):
+        return _FigureJSON(value.to_json())
+    if isinstance(value, tuple):
+        return tuple(_pack(v) for v in value)
+    return value
+
+
+def _unpack(value):
+    if isinstance(value, _FigureJSON):
+        return go.Figure(json.loads(value), _validate=False)
+    if isinstance(value, tuple):
+        return tuple(_unpack(v) for v in value)
+    return value
+
+
+def sizeof(value):
+    """Approximate bytes held by a packed value (figures count as their JSON)."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class ResultCache:
+    """Results by key: an in-memory LRU/LFU within ``max_bytes``, optional disk tier.
+
+    ``hits`` counts lookups served from memory or disk (``disk_hits`` the
+    latter), ``misses`` the rest and ``evictions`` entries dropped from
+    memory to stay within the budget.
+    """
+
+    def __init__(self, max_bytes=CACHE_BYTES, policy="lru", directory=None, disk_bytes=DISK_BYTES):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}; expected one of {POLICIES}")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        # key -> [value, size of its packed form, uses]; order is recency
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry[2] += 1
+                self.hits += 1
+        if entry is not None:
+            return entry[0]
+        packed = self._read(key)
+        with self._lock:
+            if packed is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.disk_hits += 1
+        value = _unpack(packed)
+        self._remember(key, value, sizeof(packed))
+        return value
+
+    def put(self, key, value):
+        packed = _pack(value)
+        self._remember(key, value, sizeof(packed))
+        if self.directory:
+            self._write(key, packed)
+
+    def get_or_compute(self, key, compute):
+        """Cached value of ``key``, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _remember(self, key, value, size):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = [value, size, 1 if old is None else old[2]]
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        if self.policy == "lru":
+            _, (_, size, _) = self._entries.popitem(last=False)
+        else:
+            # Least used; ties go to the least recently used.
+            victim = min(self._entries, key=lambda k: self._entries[k][2])
+            size = self._entries.pop(victim)[1]
+        self.bytes -= size
+        self.evictions += 1
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def _write(self, key, packed):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(packed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the oldest files once the directory exceeds ``disk_bytes``."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits,
+                    "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
@@ -0,0 +1,118 @@
+"""Column types shared by every loader, ingester and script.
+
+Low-cardinality text columns become categoricals, ``Quantity`` and
+``Discount`` are downcast to 32 bits (money columns stay ``float64`` so
+totals keep their cents), and ``Month`` is an ``int32`` month ordinal
+(months since 1970-01, the same numbering as ``pd.Period(..., "M")``)
+rather than a Python string per row.  Use :func:`month_start` or
+:func:`month_label` to turn ordinals back into timestamps or ``YYYY-MM``.
+
+    python -m salesdash.schema Product-Sales-Region.xlsx   # memory report
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+DATE_COLUMNS = ("Date", "OrderDate", "DeliveryDate")
+CATEGORICAL_COLUMNS = (
+    "Region", "Product", "StoreLocation", "CustomerType", "Salesperson",
+    "PaymentMethod", "Promotion", "RegionManager",
+)
+NUMERIC_DTYPES = {
+    "Quantity": "int32",
+    "UnitPrice": "float64",
+    "Discount": "float32",
+    "TotalPrice": "float64",
+    "Returned": "int64",
+    "ShippingCost": "float64",
+}
+MONTH_DTYPE = "int32"
+
+
+# -----------------------------
+# MONTH ORDINALS
+# -----------------------------
+def month_ordinal(dates):
+    """Months since 1970-01 for each date."""
+    dates = pd.DatetimeIndex(dates)
+    return np.asarray((dates.year - 1970) * 12 + dates.month - 1, dtype=MONTH_DTYPE)
+
+
+def month_start(months):
+    """First day of each month, from ordinals (or anything ``to_datetime`` parses)."""
+    values = np.asarray(months)
+    if not np.issubdtype(values.dtype, np.integer):
+        return pd.to_datetime(months)
+    values = values.astype(np.int64)
+    return pd.to_datetime(pd.DataFrame({"year": values // 12 + 1970, "month": values % 12 + 1, "day": 1}))
+
+
+def month_label(months):
+    """``YYYY-MM`` labels for month ordinals; accepts a scalar or an array."""
+    if np.ndim(months) == 0:
+        return month_start([months]).dt.strftime("%Y-%m").iloc[0]
+    return month_start(months).dt.strftime("%Y-%m").to_numpy()
+
+
+# -----------------------------
+# TYPING
+# -----------------------------
+def apply_schema(df):
+    """Return ``df`` with the shared column types and an ordinal ``Month``."""
+    df = df.rename(columns=lambda c: str(c).strip())
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    for col, dtype in NUMERIC_DTYPES.items():
+        if col in df.columns:
+            values = pd.to_numeric(df[col])
+            if np.issubdtype(np.dtype(dtype), np.integer) and values.isna().any():
+                raise ValueError(f"Column {col!r} has missing values")
+            df[col] = values.astype(dtype)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if "Date" in df.columns:
+        df["Month"] = month_ordinal(df["Date"])
+    return df
+
+
+def csv_dtypes():
+    """``dtype=`` mapping for ``pd.read_csv`` so CSVs load straight into the schema."""
+    dtypes = dict(NUMERIC_DTYPES)
+    dtypes.update({col: "category" for col in CATEGORICAL_COLUMNS})
+    return dtypes
+
+
+def memory_report(before, after):
+    """Per-column deep memory use of two frames, in bytes, with the reduction factor."""
+    report = pd.DataFrame({
+        "before": before.memory_usage(deep=True, index=False),
+        "after": after.memory_usage(deep=True, index=False),
+    })
+    report.loc["TOTAL"] = report.sum()
+    report["ratio"] = (report["before"] / report["after"]).round(2)
+    return report
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the memory saved by the shared schema.")
+    parser.add_argument("source", nargs="?", default="Product-Sales-Region.xlsx")
+    args = parser.parse_args(argv)
+
+    raw = pd.read_csv(args.source) if args.source.lower().endswith(".csv") else pd.read_excel(args.source)
+    raw.columns = raw.columns.str.strip()
+    raw["Month"] = pd.to_datetime(raw["Date"]).dt.to_period("M").astype(str)
+    print(memory_report(raw, apply_schema(raw.copy())).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+"""Interchangeable data sources behind the Streamlit dashboards.
+
+A source answers the questions the dashboards ask -- filter options, KPI
+totals, sums per date, region or month, the rows behind the box plot and
+the correlation matrix -- for a selection of regions, products and dates:
+
+* :class:`FrameSource` -- an xlsx/CSV workbook or a
+  :class:`~salesdash.store.SalesStore`, held in memory and answered from the
+  cube, index and correlation engine.
+* :class:`ParquetSource` -- a dataset written by :mod:`salesdash.ingest`;
+  filters are pushed into the Arrow scan and group-bys run in Arrow.
+* :class:`SQLSource` -- a SQLite or DuckDB database; filters and group-bys
+  compile to SQL and only aggregated results reach pandas.
+
+The dashboards open the source named by the ``SALES_SOURCE`` environment
+variable: a file or directory path, or a ``sqlite:///sales.db`` /
+``duckdb:///sales.duckdb`` URL (four slashes for an absolute path).
+
+    python -m salesdash.sources Product-Sales-Region.xlsx sqlite:///sales.db
+"""
+
+import argparse
+import contextlib
+import copy
+import hashlib
+import os
+import pathlib
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from salesdash.correlation import EXCLUDE, CorrelationEngine, matrix_from_stats, pairwise_stats
+from salesdash.cube import SalesCube
+from salesdash.index import SalesIndex
+from salesdash.ingest import CHUNK_ROWS, iter_chunks, normalize_chunk, partition_filters
+from salesdash.loader import DEFAULT_SOURCE, load_sales, load_store, source_fingerprint
+from salesdash.schema import DATE_COLUMNS, NUMERIC_DTYPES, apply_schema
+from salesdash.store import MANIFEST
+from salesdash.timeseries import DailySeries, fill_days, rolling_trend
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+SOURCE_ENV = "SALES_SOURCE"
+SQL_ENGINES = ("sqlite", "duckdb")
+TABLE = "sales"
+SQL_INDEXES = {
+    "ix_sales_date": ("Date",),
+    "ix_sales_region_product_date": ("Region", "Product", "Date"),
+}
+SQL_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def source_spec(default=DEFAULT_SOURCE):
+    """The configured source: ``$SALES_SOURCE`` or ``default``."""
+    return os.environ.get(SOURCE_ENV) or default
+
+
+def open_source(spec=None):
+    """Open the source for a path or URL (default: :func:`source_spec`)."""
+    spec = source_spec() if spec is None else spec
+    scheme, sep, rest = spec.partition("://")
+    if sep:
+        if scheme not in SQL_ENGINES:
+            raise ValueError(f"Unsupported source URL {spec!r}; expected one of {SQL_ENGINES}")
+        return SQLSource(scheme, rest[1:] if rest.startswith("/") else rest)
+    if os.path.isdir(spec) and not os.path.exists(os.path.join(spec, MANIFEST)):
+        return ParquetSource(spec)
+    if spec.lower().endswith(".parquet"):
+        return ParquetSource(spec)
+    return FrameSource(spec)
+
+
+# -----------------------------
+# BASE
+# -----------------------------
+class DataSource:
+    """Interface shared by the sources.
+
+    Every query takes ``regions``, ``products`` (``None`` for all) and an
+    inclusive ``start``/``end`` date range.  Option lists and date bounds are
+    memoised until :meth:`fingerprint` changes; ``hits``/``misses`` count
+    memo lookups.
+    """
+
+    def __init__(self):
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self):
+        raise NotImplementedError
+
+    def _cached(self, name, compute):
+        key = (name, self.fingerprint())
+        with self._memo_lock:
+            if key in self._memo:
+                self.hits += 1
+                return self._memo[key]
+            self.misses += 1
+        value = compute()
+        with self._memo_lock:
+            self._memo = {k: v for k, v in self._memo.items() if k[1] == key[1]}
+            self._memo[key] = value
+        return value
+
+    def categories(self, column):
+        """Sorted distinct values of ``column``, for the sidebar options."""
+        raise NotImplementedError
+
+    def date_bounds(self):
+        """``(first, last)`` ``Date`` in the source."""
+        raise NotImplementedError
+
+    def kpis(self, regions=None, products=None, start=None, end=None):
+        """``{"total_sales", "total_orders", "avg_discount"}`` for the selection."""
+        raise NotImplementedError
+
+    def total(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, before=None):
+        """Sum of ``measure``; ``before`` is an exclusive upper date bound."""
+        raise NotImplementedError
+
+    def by_date(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        raise NotImplementedError
+
+    def by_region(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        raise NotImplementedError
+
+    def by_month(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        """Monthly sums indexed by the first day of each month."""
+        raise NotImplementedError
+
+    def trend(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, freq="D", windows=()):
+        """Gap-filled ``measure`` per ``freq`` period with rolling means; see :func:`rolling_trend`."""
+        daily = self.by_date(measure, regions, products, start, end)
+        return rolling_trend(fill_days(daily, start, end), freq, windows)
+
+    def rows(self, columns, regions=None, products=None, start=None, end=None):
+        """The given columns of the matching rows."""
+        raise NotImplementedError
+
+    def correlation(self, regions=None, products=None, start=None, end=None):
+        """Pearson correlation matrix of the numeric columns."""
+        raise NotImplementedError
+
+
+# -----------------------------
+# IN-MEMORY FRAME
+# -----------------------------
+class FrameSource(DataSource):
+    """A workbook, CSV or store loaded by :func:`salesdash.loader.load_sales`.
+
+    After an append to a store only the new rows are folded into the cube,
+    index, correlation engine and daily series; anything else rebuilds them.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = None
+
+    def fingerprint(self):
+        return source_fingerprint(self.path)
+
+    def _current(self):
+        fingerprint = self.fingerprint()
+        with self._lock:
+            if self._state is None or self._state[0] != fingerprint:
+                self.misses += 1
+                self._state = self._extended() or self._built(fingerprint)
+            else:
+                self.hits += 1
+            return self._state
+
+    def _built(self, fingerprint):
+        if fingerprint[0] == "store":
+            # The fingerprint of the version actually read, for _extended.
+            fingerprint, df, _ = load_store(self.path)
+        else:
+            df = load_sales(self.path)
+        cube = SalesCube.from_frame(df)
+        return (fingerprint, df, cube, SalesIndex(df), CorrelationEngine.from_frame(df),
+                DailySeries.from_cube(cube))
+
+    def _extended(self):
+        """The current state with the rows appended to the store since folded in, or ``None``."""
+        if self._state is None or self._state[0][0] != "store":
+            return None
+        old_fingerprint, _, cube, index, engine, _ = self._state
+        fingerprint, df, rows = load_store(self.path, since=old_fingerprint[1])
+        # SalesStore.append rejects OrderIDs already stored, so the new rows
+        # are new orders and their distinct counts add up.
+        if rows is None:
+            return None
+        cube = cube.add(rows)
+        index = index.extend(df, rows)
+        if cube is None or index is None:
+            return None
+        # Copied so that queries running on the previous state stay consistent.
+        engine = copy.deepcopy(engine).add(rows)
+        return fingerprint, df, cube, index, engine, DailySeries.from_cube(cube)
+
+    @property
+    def frame(self):
+        return self._current()[1]
+
+    def _view(self, regions, products, start, end):
+        return self._current()[2].query(regions, products, start, end)
+
+    def categories(self, column):
+        return self.frame[column].astype("category").cat.categories.tolist()
+
+    def date_bounds(self):
+        dates = self.frame["Date"]
+        return dates.iloc[0], dates.iloc[-1]
+
+    def kpis(self, regions=None, products=None, start=None, end=None):
+        view = self._view(regions, products, start, end)
+        return {
+            "total_sales": view.total("TotalPrice"),
+            "total_orders": view.nunique_orders(),
+            "avg_discount": view.mean("Discount"),
+        }
+
+    def total(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, before=None):
+        return self._current()[3].total(measure, regions, products, start, end, before)
+
+    def by_date(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        return self._view(regions, products, start, end).by_date(measure)
+
+    def by_region(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        return self._view(regions, products, start, end).by_region(measure)
+
+    def by_month(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        return self._view(regions, products, start, end).by_month(measure)
+
+    def trend(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, freq="D", windows=()):
+        return self._current()[5].trend(measure, regions, products, start, end, freq, windows)
+
+    def rows(self, columns, regions=None, products=None, start=None, end=None):
+        index = self._current()[3]
+        return index.columns(columns, index.rows(regions, products, start=start, end=end))
+
+    def correlation(self, regions=None, products=None, start=None, end=None):
+        return self._current()[4].matrix(regions, products, start, end)
+
+
+# -----------------------------
+# PARQUET DATASET
+# -----------------------------
+class ParquetSource(DataSource):
+    """A month-partitioned Parquet dataset, scanned with pyarrow."""
+
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+
+    def _dataset(self):
+        partitioning = ds.partitioning(pa.schema([("Month", pa.string())]), flavor="hive")
+        return ds.dataset(self.root, format="parquet", partitioning=partitioning)
+
+    def fingerprint(self):
+        stamps = []
+        for path in self._dataset().files:
+            st = os.stat(path)
+            stamps.append((path, st.st_mtime_ns, st.st_size))
+        # A content-free digest that is stable across processes, unlike hash()
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr(sorted(stamps)).encode("utf-8"))
+        return h.hexdigest()
+
+    def _table(self, columns, regions=None, products=None, start=None, end=None, before=None):
+        dataset = self._dataset()
+        if (regions is not None and not len(regions)) or (products is not None and not len(products)):
+            # An empty "in" list has no type to bind to; nothing can match anyway.
+            return dataset.schema.empty_table().select(list(columns))
+        filters = partition_filters(regions, products, start, end, before)
+        expression = None if filters is None else pq.filters_to_expression(filters)
+        return dataset.to_table(columns=list(columns), filter=expression)
+
+    def _grouped(self, key, measure, filters):
+        table = self._table([key, measure], *filters)
+        table = table.set_column(1, measure, pc.cast(table[measure], pa.float64()))
+        out = table.group_by(key).aggregate([(measure, "sum")]).to_pandas()
+        return out.set_index(key)[f"{measure}_sum"].rename(measure).sort_index()
+
+    def categories(self, column):
+        return self._cached(("categories", column), lambda: sorted(
+            pc.unique(self._table([column])[column]).to_pylist()))
+
+    def date_bounds(self):
+        def compute():
+            bounds = pc.min_max(self._table(["Date"])["Date"]).as_py()
+            return pd.Timestamp(bounds["min"]), pd.Timestamp(bounds["max"])
+        return self._cached("date_bounds", compute)
+
+    def kpis(self, regions=None, products=None, start=None, end=None):
+        table = self._table(["TotalPrice", "Discount", "OrderID"], regions, products, start, end)
+        avg_discount = pc.mean(table["Discount"]).as_py()
+        return {
+            "total_sales": pc.sum(pc.cast(table["TotalPrice"], pa.float64())).as_py() or 0.0,
+            "total_orders": pc.count_distinct(table["OrderID"]).as_py(),
+            "avg_discount": float("nan") if avg_discount is None else avg_discount,
+        }
+
+    def total(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, before=None):
+        table = self._table([measure], regions, products, start, end, before)
+        return pc.sum(pc.cast(table[measure], pa.float64())).as_py() or 0.0
+
+    def by_date(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        out = self._grouped("Date", measure, (regions, products, start, end))
+        out.index = pd.DatetimeIndex(out.index, name="Date")
+        return out
+
+    def by_region(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        return self._grouped("Region", measure, (regions, products, start, end))
+
+    def by_month(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        out = self._grouped("Month", measure, (regions, products, start, end))
+        out.index = pd.to_datetime(out.index, format="%Y-%m").rename("Month")
+        return out
+
+    def rows(self, columns, regions=None, products=None, start=None, end=None):
+        return apply_schema(self._table(columns, regions, products, start, end).to_pandas())
+
+    def _numeric_columns(self):
+        names = self._dataset().schema.names
+        return [c for c in names if c in NUMERIC_DTYPES and c not in EXCLUDE]
+
+    def correlation(self, regions=None, products=None, start=None, end=None):
+        columns = self._numeric_columns()
+        stats = np.zeros((4, len(columns), len(columns)))
+        for batch in self._table(columns, regions, products, start, end).to_batches():
+            if batch.num_rows:
+                values = np.column_stack([
+                    batch.column(c).to_numpy(zero_copy_only=False).astype(np.float64) for c in columns
+                ])
+                stats += pairwise_stats(values)
+        return matrix_from_stats(stats, columns)
+
+
+# -----------------------------
+# EMBEDDED SQL
+# -----------------------------
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_time(value):
+    return pd.Timestamp(value).strftime(SQL_TIME_FORMAT)
+
+
+def compile_filters(regions=None, products=None, start=None, end=None, before=None):
+    """``(" WHERE ...", params)`` for the filters, using ``?`` placeholders."""
+    clauses, params = [], []
+    for column, values in (("Region", regions), ("Product", products)):
+        if values is None:
+            continue
+        values = list(values)
+        if not values:
+            clauses.append("1 = 0")
+            continue
+        clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+        params += values
+    for op, value in ((">=", start), ("<=", end), ("<", before)):
+        if value is not None:
+            clauses.append(f"{_quote('Date')} {op} ?")
+            params.append(_sql_time(value))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class SQLSource(DataSource):
+    """A ``sales`` table in SQLite or DuckDB; all filtering and grouping runs in SQL.
+
+    Dates are stored as ``YYYY-MM-DD HH:MM:SS`` text in SQLite and as
+    timestamps in DuckDB, with a ``Month`` (``YYYY-MM``) column for the
+    monthly group-by.  Load one with :func:`load_sql`.
+    """
+
+    def __init__(self, engine, database, table=TABLE):
+        super().__init__()
+        if engine not in SQL_ENGINES:
+            raise ValueError(f"Unknown SQL engine {engine!r}")
+        self.engine = engine
+        self.database = database
+        self.table = table
+
+    def _connect(self, read_only=True):
+        if self.engine == "duckdb":
+            import duckdb
+
+            return duckdb.connect(self.database, read_only=read_only)
+        if read_only:
+            return sqlite3.connect(pathlib.Path(self.database).absolute().as_uri() + "?mode=ro",
+                                   uri=True, check_same_thread=False)
+        return sqlite3.connect(self.database)
+
+    def _query(self, sql, params=()):
+        with contextlib.closing(self._connect()) as con:
+            cursor = con.execute(sql, list(params))
+            columns = [d[0] for d in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def fingerprint(self):
+        st = os.stat(self.database)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _select(self, expressions, filters=(), group_by=None):
+        where, params = compile_filters(*filters)
+        sql = f"SELECT {', '.join(expressions)} FROM {_quote(self.table)}{where}"
+        if group_by:
+            sql += f" GROUP BY {_quote(group_by)} ORDER BY {_quote(group_by)}"
+        return self._query(sql, params)
+
+    def _grouped(self, key, measure, filters):
+        out = self._select([_quote(key), f"SUM({_quote(measure)}) AS {_quote(measure)}"], filters, group_by=key)
+        return out.set_index(key)[measure].astype(np.float64)
+
+    def categories(self, column):
+        return self._cached(("categories", column), lambda: self._query(
+            f"SELECT DISTINCT {_quote(column)} FROM {_quote(self.table)} ORDER BY 1").iloc[:, 0].tolist())
+
+    def date_bounds(self):
+        def compute():
+            row = self._select([f"MIN({_quote('Date')})", f"MAX({_quote('Date')})"]).iloc[0]
+            return pd.Timestamp(row.iloc[0]), pd.Timestamp(row.iloc[1])
+        return self._cached("date_bounds", compute)
+
+    def kpis(self, regions=None, products=None, start=None, end=None):
+        row = self._select([
+            f"SUM({_quote('TotalPrice')}) AS total_sales",
+            f"COUNT(DISTINCT {_quote('OrderID')}) AS total_orders",
+            f"AVG({_quote('Discount')}) AS avg_discount",
+        ], (regions, products, start, end)).iloc[0]
+        return {
+            "total_sales": float(row["total_sales"] or 0.0),
+            "total_orders": int(row["total_orders"]),
+            "avg_discount": float("nan") if pd.isna(row["avg_discount"]) else float(row["avg_discount"]),
+        }
+
+    def total(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, before=None):
+        value = self._select([f"SUM({_quote(measure)})"], (regions, products, start, end, before)).iloc[0, 0]
+        return 0.0 if pd.isna(value) else float(value)
+
+    def by_date(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        out = self._grouped("Date", measure, (regions, products, start, end))
+        out.index = pd.DatetimeIndex(pd.to_datetime(out.index), name="Date")
+        return out
+
+    def by_region(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        return self._grouped("Region", measure, (regions, products, start, end))
+
+    def by_month(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        out = self._grouped("Month", measure, (regions, products, start, end))
+        out.index = pd.to_datetime(out.index, format="%Y-%m").rename("Month")
+        return out
+
+    def rows(self, columns, regions=None, products=None, start=None, end=None):
+        return apply_schema(self._select([_quote(c) for c in columns], (regions, products, start, end)))
+
+    def _numeric_columns(self):
+        def compute():
+            names = self._query(f"SELECT * FROM {_quote(self.table)} LIMIT 0").columns
+            return [c for c in names if c in NUMERIC_DTYPES and c not in EXCLUDE]
+        return self._cached("numeric_columns", compute)
+
+    def correlation(self, regions=None, products=None, start=None, end=None):
+        """Pairwise-complete Pearson correlation from sums computed in one query."""
+        columns = self._numeric_columns()
+        k = len(columns)
+        expressions, slots = [], []
+        for i in range(k):
+            for j in range(i, k):
+                x, y = _quote(columns[i]), _quote(columns[j])
+                both = f"{x} IS NOT NULL AND {y} IS NOT NULL"
+                expressions += [
+                    f"SUM(CASE WHEN {both} THEN 1 ELSE 0 END)",
+                    f"SUM(CASE WHEN {both} THEN {x} END)",
+                    f"SUM(CASE WHEN {both} THEN {y} END)",
+                    f"SUM(CASE WHEN {both} THEN {x} * {x} END)",
+                    f"SUM(CASE WHEN {both} THEN {y} * {y} END)",
+                    f"SUM({x} * {y})",
+                ]
+                slots.append((i, j))
+        values = self._select(expressions, (regions, products, start, end)).iloc[0].to_numpy(dtype=np.float64)
+        values = np.nan_to_num(values).reshape(-1, 6)
+        stats = np.zeros((4, k, k))
+        for (i, j), (n, sx, sy, sxx, syy, sxy) in zip(slots, values):
+            stats[:, i, j] = n, sx, sxx, sxy
+            stats[:, j, i] = n, sy, syy, sxy
+        return matrix_from_stats(stats, columns)
+
+
+def load_sql(source, url, chunksize=CHUNK_ROWS):
+    """Stream an xlsx/CSV export into the ``sales`` table of a SQL source.
+
+    Replaces any existing table.  Returns the number of rows loaded.
+    """
+    target = open_source(url)
+    if not isinstance(target, SQLSource):
+        raise ValueError(f"Not a SQL source: {url!r}")
+    table = _quote(target.table)
+    rows = 0
+    with contextlib.closing(target._connect(read_only=False)) as con:
+        for i, chunk in enumerate(iter_chunks(source, chunksize)):
+            chunk = normalize_chunk(chunk)
+            if target.engine == "sqlite":
+                for col in DATE_COLUMNS:
+                    if col in chunk.columns:
+                        chunk[col] = chunk[col].dt.strftime(SQL_TIME_FORMAT)
+                chunk.to_sql(target.table, con, if_exists="replace" if i == 0 else "append", index=False)
+            else:
+                con.register("_chunk", chunk)
+                verb = f"CREATE OR REPLACE TABLE {table} AS" if i == 0 else f"INSERT INTO {table}"
+                con.execute(f"{verb} SELECT * FROM _chunk")
+                con.unregister("_chunk")
+            rows += len(chunk)
+        for name, columns in SQL_INDEXES.items():
+            con.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(map(_quote, columns))})")
+        if target.engine == "sqlite":
+            con.commit()
+    return rows
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load a sales export into a SQLite or DuckDB source.")
+    parser.add_argument("source", help="xlsx or csv file")
+    parser.add_argument("url", help="sqlite:///sales.db or duckdb:///sales.duckdb")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    rows = load_sql(args.source, args.url, args.chunksize)
+    print(f"Loaded {rows:,} rows into {args.url}")
+
+
+if __name__ == "__main__":
+    main()
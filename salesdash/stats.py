@@ -0,0 +1,366 @@
+"""Per-group distribution summaries for the box, violin and annotation views.
+
+``summarize`` sorts the values once by (group, value) and reads quartiles,
+whiskers, outliers, mean and median for every group off that single ordering.
+Densities are Gaussian KDEs evaluated on one shared grid from binned counts.
+The renderers below draw from a summary and never see the raw rows.
+
+For data that does not fit in memory, :class:`QuantileSketch` is a mergeable
+log-bucket sketch (in the style of DDSketch) with bounded relative error.
+``summarize(..., approximate=True)`` takes a DataFrame or an iterable of
+chunks (e.g. ``pd.read_csv(..., chunksize=...)``) and keeps one chunk and a
+sketch per group in memory; densities then come from the sketch buckets and
+no outliers are listed.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.colors
+import plotly.graph_objects as go
+
+from salesdash.charts import typed_array
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+GRID_SIZE = 256
+WHIS = 1.5
+SKETCH_ACCURACY = 0.01
+
+
+# -----------------------------
+# QUANTILE SKETCH
+# -----------------------------
+class QuantileSketch:
+    """Log-bucketed counts; quantiles are within ``accuracy`` relative error.
+
+    Sketches with the same accuracy merge by adding bucket counts, so chunks
+    and groups can be summarised independently and combined later.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _add_store(self, store, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        uniq, counts = np.unique(keys, return_counts=True)
+        for k, c in zip(uniq.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self._add_store(self.positive, values[values > 0])
+        self._add_store(self.negative, -values[values < 0])
+        self.zeros += int((values == 0).sum())
+        self.count += len(values)
+        return self
+
+    def merge(self, other):
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for k, c in theirs.items():
+                mine[k] = mine.get(k, 0) + c
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def _value(self, key, sign):
+        return sign * 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return self._value(key, -1)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key, 1)
+        return self._value(max(self.positive), 1)
+
+    def buckets(self):
+        """``(values, counts)``: each non-empty bucket's representative value and count."""
+        keys = [(k, -1) for k in self.negative] + [(k, 1) for k in self.positive]
+        values = [self._value(k, sign) for k, sign in keys] + ([0.0] if self.zeros else [])
+        counts = ([self.negative[k] for k in self.negative] + [self.positive[k] for k in self.positive]
+                  + ([self.zeros] if self.zeros else []))
+        return np.asarray(values, dtype=np.float64), np.asarray(counts, dtype=np.float64)
+
+
+# -----------------------------
+# SUMMARIES
+# -----------------------------
+class GroupSummary:
+    """Distribution statistics for each group of one numeric column.
+
+    ``table`` has one row per group with count, mean, median, q1, q3,
+    whislo, whishi, min and max.  ``fliers`` holds each group's outliers,
+    ``density`` one KDE row per group over the shared ``grid``.
+    """
+
+    def __init__(self, value, table, fliers, grid, density):
+        self.value = value
+        self.table = table
+        self.fliers = fliers
+        self.grid = grid
+        self.density = density
+
+    @property
+    def groups(self):
+        return self.table.index
+
+    def bxp_stats(self):
+        """Statistics in the shape ``matplotlib.axes.Axes.bxp`` expects."""
+        return [
+            dict(label=str(g), mean=row["mean"], med=row["median"], q1=row["q1"], q3=row["q3"],
+                 whislo=row["whislo"], whishi=row["whishi"], fliers=self.fliers[i])
+            for i, (g, row) in enumerate(self.table.iterrows())
+        ]
+
+    def violin_stats(self):
+        """Statistics in the shape ``matplotlib.axes.Axes.violin`` expects."""
+        out = []
+        for i, (_, row) in enumerate(self.table.iterrows()):
+            inside = (self.grid >= row["min"]) & (self.grid <= row["max"])
+            out.append(dict(coords=self.grid[inside], vals=self.density[i][inside], mean=row["mean"],
+                            median=row["median"], min=row["min"], max=row["max"]))
+        return out
+
+
+def _sorted_quantile(sorted_values, q):
+    pos = q * (len(sorted_values) - 1)
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _binned_kde(codes, values, n_groups, grid, counts, weights=None):
+    """Gaussian KDE per group using Scott's bandwidth on linearly binned counts."""
+    step = grid[1] - grid[0] if len(grid) > 1 else 1.0
+    pos = np.clip((values - grid[0]) / step, 0, len(grid) - 1)
+    left = np.floor(pos).astype(np.int64)
+    right = np.minimum(left + 1, len(grid) - 1)
+    frac = pos - left
+    if weights is None:
+        weights = np.ones(len(values))
+    size = n_groups * len(grid)
+    binned = (np.bincount(codes * len(grid) + left, weights=(1 - frac) * weights, minlength=size)
+              + np.bincount(codes * len(grid) + right, weights=frac * weights, minlength=size))
+    binned = binned.reshape(n_groups, len(grid))
+
+    density = np.zeros_like(binned)
+    for g in range(n_groups):
+        n, std = counts[g, 0], counts[g, 1]
+        if n < 2 or not std > 0:
+            continue
+        bw = std * n ** (-1 / 5)
+        half = int(min(len(grid) - 1, math.ceil(4 * bw / step)))
+        offsets = np.arange(-half, half + 1) * step
+        kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * math.sqrt(2 * math.pi))
+        # Full convolution, centred; mode="same" would return the kernel's
+        # length whenever the bandwidth spans more than half the grid.
+        density[g] = np.convolve(binned[g], kernel)[half:half + len(grid)] / n
+    return density
+
+
+def _sketched(chunks, by, value, grid_size, whis, accuracy):
+    """Approximate :func:`summarize` over ``chunks``, holding one chunk at a time."""
+    groups = {}
+    for chunk in chunks:
+        cat = pd.Categorical(chunk[by])
+        values = chunk[value].to_numpy(dtype=np.float64)
+        valid = (cat.codes >= 0) & ~np.isnan(values)
+        codes = cat.codes[valid].astype(np.int64)
+        values = values[valid]
+        order = np.argsort(codes, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(cat.categories)))])
+        for g, label in enumerate(cat.categories):
+            part = values[order[bounds[g]:bounds[g + 1]]]
+            if not len(part):
+                continue
+            entry = groups.get(label)
+            if entry is None:
+                entry = groups[label] = {"sketch": QuantileSketch(accuracy), "count": 0, "sum": 0.0,
+                                         "sumsq": 0.0, "min": np.inf, "max": -np.inf}
+            entry["sketch"].add(part)
+            entry["count"] += len(part)
+            entry["sum"] += float(part.sum())
+            entry["sumsq"] += float((part * part).sum())
+            entry["min"] = min(entry["min"], float(part.min()))
+            entry["max"] = max(entry["max"], float(part.max()))
+
+    labels = sorted(groups)
+    rows, counts = [], np.zeros((len(labels), 2))
+    codes, centres, weights = [np.empty(0, np.int64)], [np.empty(0)], [np.empty(0)]
+    for g, label in enumerate(labels):
+        entry = groups[label]
+        n, mean = entry["count"], entry["sum"] / entry["count"]
+        q1, med, q3 = (entry["sketch"].quantile(q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        rows.append(dict(count=n, mean=mean, median=med, q1=q1, q3=q3,
+                         whislo=max(entry["min"], q1 - whis * iqr), whishi=min(entry["max"], q3 + whis * iqr),
+                         min=entry["min"], max=entry["max"]))
+        var = max(entry["sumsq"] - entry["sum"] * mean, 0) / (n - 1) if n > 1 else np.nan
+        counts[g] = n, math.sqrt(var)
+        bucket_values, bucket_counts = entry["sketch"].buckets()
+        codes.append(np.full(len(bucket_values), g, dtype=np.int64))
+        centres.append(bucket_values)
+        weights.append(bucket_counts)
+
+    columns = ["count", "mean", "median", "q1", "q3", "whislo", "whishi", "min", "max"]
+    table = pd.DataFrame(rows, index=pd.Index(labels, name=by), columns=columns)
+    lo_v, hi_v = (table["min"].min(), table["max"].max()) if labels else (0.0, 1.0)
+    grid = np.linspace(lo_v, hi_v, grid_size)
+    density = _binned_kde(np.concatenate(codes), np.concatenate(centres), len(labels), grid, counts,
+                          np.concatenate(weights))
+    return GroupSummary(value, table, [np.empty(0) for _ in labels], grid, density)
+
+
+def summarize(df, by, value="TotalPrice", grid_size=GRID_SIZE, whis=WHIS, approximate=False,
+              accuracy=SKETCH_ACCURACY):
+    """Summarise ``value`` per ``by`` group in one grouped pass.
+
+    With ``approximate``, ``df`` may also be an iterable of DataFrame chunks.
+    """
+    if approximate:
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        return _sketched(chunks, by, value, grid_size, whis, accuracy)
+    cat = pd.Categorical(df[by])
+    values = df[value].to_numpy(dtype=np.float64)
+    valid = (cat.codes >= 0) & ~np.isnan(values)
+    codes = cat.codes[valid].astype(np.int64)
+    values = values[valid]
+    n_groups = len(cat.categories)
+
+    n = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    sumsq = np.bincount(codes, weights=values * values, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / n
+        std = np.sqrt(np.maximum(sumsq - sums * means, 0) / (n - 1))
+
+    rows, fliers = [], []
+    order = np.lexsort((values, codes))
+    ordered = values[order]
+    bounds = np.concatenate([[0], np.cumsum(n)])
+    for g in range(n_groups):
+        s = ordered[bounds[g]:bounds[g + 1]]
+        if not len(s):
+            rows.append(dict(count=0, mean=np.nan, median=np.nan, q1=np.nan, q3=np.nan,
+                             whislo=np.nan, whishi=np.nan, min=np.nan, max=np.nan))
+            fliers.append(np.empty(0))
+            continue
+        q1, med, q3 = (_sorted_quantile(s, q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        lo = int(np.searchsorted(s, q1 - whis * iqr, side="left"))
+        hi = int(np.searchsorted(s, q3 + whis * iqr, side="right"))
+        rows.append(dict(count=len(s), mean=means[g], median=med, q1=q1, q3=q3,
+                         whislo=s[min(lo, len(s) - 1)], whishi=s[max(hi - 1, 0)],
+                         min=s[0], max=s[-1]))
+        fliers.append(np.concatenate([s[:lo], s[hi:]]))
+
+    table = pd.DataFrame(rows, index=pd.Index(cat.categories, name=by))
+    keep = table["count"].to_numpy() > 0
+    lo_v, hi_v = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+    grid = np.linspace(lo_v, hi_v, grid_size)
+    density = _binned_kde(codes, values, n_groups, grid, np.column_stack([n, std]))
+    return GroupSummary(value, table[keep], [f for f, k in zip(fliers, keep) if k], grid, density[keep])
+
+
+# -----------------------------
+# MATPLOTLIB RENDERERS
+# -----------------------------
+def draw_box(ax, summary, colors=None, showmeans=False, meanprops=None, showfliers=True, width=0.8):
+    stats = summary.bxp_stats()
+    boxes = ax.bxp(stats, positions=range(len(stats)), widths=width, patch_artist=True,
+                   showmeans=showmeans, meanprops=meanprops, showfliers=showfliers,
+                   medianprops={"color": "0.2"})
+    for patch, color in zip(boxes["boxes"], colors or []):
+        patch.set_facecolor(color)
+    ax.set_xticks(range(len(stats)), [s["label"] for s in stats])
+    ax.set_xlabel(summary.table.index.name)
+    ax.set_ylabel(summary.value)
+    return ax
+
+
+def draw_violin(ax, summary, colors=None, inner="quartile", alpha=1.0, width=0.8):
+    stats = summary.violin_stats()
+    parts = ax.violin(stats, positions=range(len(stats)), widths=width,
+                      showmeans=False, showextrema=False, showmedians=False)
+    for body, color in zip(parts["bodies"], colors or []):
+        body.set_facecolor(color)
+        body.set_edgecolor("0.3")
+        body.set_alpha(alpha)
+    if inner == "quartile":
+        for i, (stat, (_, row)) in enumerate(zip(stats, summary.table.iterrows())):
+            peak = stat["vals"].max() if len(stat["vals"]) else 0
+            for q, style in ((row["q1"], "--"), (row["median"], "-"), (row["q3"], "--")):
+                half = width / 2 * np.interp(q, stat["coords"], stat["vals"]) / peak if peak else 0
+                ax.plot([i - half, i + half], [q, q], linestyle=style, color="0.2", linewidth=1)
+    ax.set_xticks(range(len(stats)), summary.table.index.astype(str))
+    ax.set_xlabel(summary.table.index.name)
+    ax.set_ylabel(summary.value)
+    return ax
+
+
+# -----------------------------
+# PLOTLY RENDERERS
+# -----------------------------
+def plotly_box(summary, title=None, template=None, showfliers=True, colors=None):
+    """One precomputed box (quartiles, fences, mean) per group plus its outliers.
+
+    The payload holds five numbers per group and the outliers as typed
+    arrays, rather than every row as ``px.box`` would ship.
+    """
+    colors = colors or plotly.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, (g, row) in enumerate(summary.table.iterrows()):
+        name = str(g)
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            name=name, x=[name], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+            lowerfence=[row["whislo"]], upperfence=[row["whishi"]], mean=[row["mean"]],
+            legendgroup=name, offsetgroup=name, marker_color=color,
+        ))
+        if showfliers and len(summary.fliers[i]):
+            fig.add_trace(go.Scatter(
+                x=[name] * len(summary.fliers[i]), y=typed_array(summary.fliers[i]), mode="markers",
+                name=name, legendgroup=name, showlegend=False, marker={"size": 4, "color": color},
+            ))
+    fig.update_layout(title=title, template=template, xaxis_title=summary.table.index.name,
+                      yaxis_title=summary.value, boxmode="overlay")
+    return fig
+
+
+def plotly_violin(summary, title=None, template=None, width=0.8):
+    fig = go.Figure()
+    names = summary.table.index.astype(str).tolist()
+    for i, stat in enumerate(summary.violin_stats()):
+        peak = stat["vals"].max() if len(stat["vals"]) else 1.0
+        half = stat["vals"] / peak * width / 2
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([i - half, (i + half)[::-1]]),
+            y=np.concatenate([stat["coords"], stat["coords"][::-1]]),
+            fill="toself", mode="lines", name=names[i], hoverinfo="name",
+        ))
+    fig.update_layout(title=title, template=template, yaxis_title=summary.value,
+                      xaxis={"tickmode": "array", "tickvals": list(range(len(names))), "ticktext": names,
+                             "title": summary.table.index.name})
+    return fig
@@ -0,0 +1,267 @@
+"""Append-only sales store on top of the partitioned Parquet dataset.
+
+A store directory holds the month partitions written by :mod:`salesdash.ingest`,
+a ``_daily.parquet`` table of per (Date, Region, Product) aggregates and a
+``_manifest.json`` with a version counter.  ``append`` validates a batch,
+writes it as new partition files and folds its aggregates into the daily
+table, so the work done depends on the batch and the number of aggregate
+cells, never on the rows already stored.  Readers such as
+:func:`salesdash.loader.load_sales` key their caches on the version; on
+their next call they read only the files of the versions they have not seen
+(:meth:`SalesStore.load_since`) and fold those rows into what they hold.
+
+    python -m salesdash.store init sales_store Product-Sales-Region.xlsx
+    python -m salesdash.store append sales_store new-orders.csv
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from salesdash.ingest import CHUNK_ROWS, iter_chunks, normalize_chunk, read_partitions, write_partitions
+from salesdash.schema import apply_schema
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+MANIFEST = "_manifest.json"
+DAILY = "_daily.parquet"
+KEYS = ["Date", "Region", "Product"]
+REQUIRED_COLUMNS = KEYS + ["OrderID", "Quantity", "UnitPrice", "Discount", "TotalPrice"]
+SUM_MEASURES = ["TotalPrice", "Quantity", "Discount"]
+# Partition files of an append are named v<version>-...
+BATCH_FILE = re.compile(r"v(\d{6})-.*\.parquet$")
+
+
+# -----------------------------
+# VALIDATION & AGGREGATION
+# -----------------------------
+def validate_batch(df):
+    """Check a batch against the schema and return it normalised.
+
+    Raises ``ValueError`` naming the offending columns or repeated OrderIDs.
+    """
+    df = df.rename(columns=lambda c: str(c).strip())
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Batch is missing required columns: {missing}")
+    df = normalize_chunk(df)
+    empty = [c for c in REQUIRED_COLUMNS if df[c].isna().any()]
+    if empty:
+        raise ValueError(f"Batch has missing values in: {empty}")
+    repeated = df["OrderID"][df["OrderID"].duplicated()].unique().tolist()
+    if repeated:
+        raise ValueError(f"Batch repeats OrderIDs: {repeated[:10]}")
+    return df
+
+
+def daily_aggregates(df):
+    """Per (Date, Region, Product) sums and distinct order counts for a batch of rows.
+
+    Merged tables add the counts; :meth:`SalesStore.append` rejects batches
+    with orders already stored, so no order is counted twice.
+    """
+    out = (
+        df.groupby(KEYS, observed=True)
+        .agg(**{m: (m, "sum") for m in SUM_MEASURES}, Orders=("OrderID", "nunique"))
+        .reset_index()
+    )
+    out["Region"] = out["Region"].astype(str)
+    out["Product"] = out["Product"].astype(str)
+    out["Quantity"] = out["Quantity"].astype("int64")
+    out["Discount"] = out["Discount"].astype("float64")
+    return out
+
+
+def _merge_daily(current, batch):
+    if current is None or current.empty:
+        return batch.sort_values(KEYS, ignore_index=True)
+    merged = pd.concat([current, batch], ignore_index=True)
+    return merged.groupby(KEYS, as_index=False, sort=True)[SUM_MEASURES + ["Orders"]].sum()
+
+
+# -----------------------------
+# STORE
+# -----------------------------
+class SalesStore:
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+        # (version, OrderIDs stored up to that version)
+        self._orders = None
+
+    # -- manifest -------------------------------------------------------
+    def manifest(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": 0, "rows": 0}
+
+    @property
+    def version(self):
+        return self.manifest()["version"]
+
+    def _write_manifest(self, manifest):
+        target = os.path.join(self.root, MANIFEST)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, target)
+
+    # -- writing --------------------------------------------------------
+    @classmethod
+    def create(cls, root, source, chunksize=CHUNK_ROWS):
+        """Initialise a store at ``root`` from an xlsx/CSV export."""
+        store = cls(root)
+        for chunk in iter_chunks(source, chunksize):
+            store.append(chunk)
+        return store
+
+    def append(self, batch):
+        """Validate ``batch`` (a DataFrame or CSV path) and add it to the store.
+
+        Raises ``ValueError`` if the batch holds an OrderID that is already
+        stored.  Returns the new store version.
+        """
+        if isinstance(batch, (str, os.PathLike)):
+            batch = pd.read_csv(batch)
+        batch = validate_batch(batch)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            manifest = self.manifest()
+            orders = self._order_ids(manifest["version"])
+            stored = [order for order in batch["OrderID"] if order in orders]
+            if stored:
+                raise ValueError(f"Batch has OrderIDs already in the store: {stored[:10]}")
+            version = manifest["version"] + 1
+            write_partitions([batch], self.root, prefix=f"v{version:06d}")
+
+            daily = _merge_daily(self.daily(), daily_aggregates(batch))
+            tmp = os.path.join(self.root, f"{DAILY}.{os.getpid()}.tmp")
+            daily.to_parquet(tmp, index=False)
+            os.replace(tmp, os.path.join(self.root, DAILY))
+
+            self._write_manifest({"version": version, "rows": manifest["rows"] + len(batch)})
+            orders.update(batch["OrderID"])
+            self._orders = (version, orders)
+            return version
+
+    def _order_ids(self, version):
+        """Set of the OrderIDs stored up to ``version``.
+
+        The set is kept between appends; only the files of versions it has
+        not seen yet (written by other processes) are read.
+        """
+        seen, orders = self._orders or (0, set())
+        if seen > version:
+            # The store was recreated; start over.
+            seen, orders = 0, set()
+        files = self.batch_files(seen, version) if seen < version else []
+        if files:
+            orders.update(ds.dataset(files, format="parquet").to_table(columns=["OrderID"])["OrderID"].to_pylist())
+        self._orders = (version, orders)
+        return orders
+
+    # -- reading --------------------------------------------------------
+    def load(self, **filters):
+        """Rows of the store, optionally filtered (see ``read_partitions``)."""
+        return read_partitions(self.root, **filters)
+
+    def batch_files(self, after=0, upto=None):
+        """Partition files written by the appends after version ``after`` up to ``upto``."""
+        files = []
+        for month in os.scandir(self.root):
+            if not (month.is_dir() and month.name.startswith("Month=")):
+                continue
+            for entry in os.scandir(month.path):
+                match = BATCH_FILE.match(entry.name)
+                if match and int(match.group(1)) > after and (upto is None or int(match.group(1)) <= upto):
+                    files.append(entry.path)
+        return sorted(files)
+
+    def load_since(self, after=0, upto=None):
+        """Rows appended after version ``after`` (up to ``upto``), shaped like :meth:`load`.
+
+        Only the files of those versions are opened, so the cost depends on
+        the new rows, not on the size of the store.
+        """
+        files = self.batch_files(after, upto)
+        if not files:
+            return self.load(regions=[])
+        partitioning = ds.partitioning(pa.schema([("Month", pa.string())]), flavor="hive")
+        dataset = ds.dataset(files, format="parquet", partitioning=partitioning, partition_base_dir=self.root)
+        df = apply_schema(dataset.to_table().to_pandas().drop(columns="Month"))
+        return df.sort_values("Date", kind="stable", ignore_index=True)
+
+    def daily(self):
+        path = os.path.join(self.root, DAILY)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def _selected(self, regions=None, products=None, start=None, end=None):
+        daily = self.daily()
+        if daily is None:
+            return pd.DataFrame(columns=KEYS + SUM_MEASURES + ["Orders"])
+        mask = pd.Series(True, index=daily.index)
+        if regions is not None:
+            mask &= daily["Region"].isin(list(regions))
+        if products is not None:
+            mask &= daily["Product"].isin(list(products))
+        if start is not None:
+            mask &= daily["Date"] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= daily["Date"] <= pd.Timestamp(end)
+        return daily[mask]
+
+    def daily_trend(self, regions=None, products=None, start=None, end=None, window=7):
+        """Daily ``TotalPrice`` with its rolling mean, from the aggregate table."""
+        trend = (self._selected(regions, products, start, end)
+                 .groupby("Date", as_index=False)["TotalPrice"].sum())
+        trend["Rolling_Avg"] = trend["TotalPrice"].rolling(window, min_periods=1).mean()
+        return trend
+
+    def region_totals(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        return (self._selected(regions, products, start, end)
+                .groupby("Region", as_index=False)[measure].sum())
+
+    def monthly_series(self, regions=None, products=None, start=None, end=None):
+        """Monthly ``TotalPrice`` with ``Month`` as the first day of each month."""
+        selected = self._selected(regions, products, start, end)
+        month = selected["Date"].dt.to_period("M").dt.to_timestamp()
+        return selected.groupby(month.rename("Month"))["TotalPrice"].sum().reset_index()
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage an append-only sales store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    init = sub.add_parser("init", help="create a store from an xlsx/csv export")
+    init.add_argument("root")
+    init.add_argument("source")
+    add = sub.add_parser("append", help="append a CSV batch of new orders")
+    add.add_argument("root")
+    add.add_argument("batch")
+    args = parser.parse_args(argv)
+
+    if args.command == "init":
+        store = SalesStore.create(args.root, args.source)
+    else:
+        store = SalesStore(args.root)
+        store.append(args.batch)
+    manifest = store.manifest()
+    print(f"{args.root}: version {manifest['version']}, {manifest['rows']:,} rows")
+
+
+if __name__ == "__main__":
+    main()
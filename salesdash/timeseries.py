@@ -0,0 +1,120 @@
+"""Rolling windows and resampled granularities for the trend lines.
+
+:class:`DailySeries` keeps every (Region, Product) pair's daily sums as one
+gap-filled row of a dense ``[region, product, day]`` array.  It is built from
+a :class:`~salesdash.cube.SalesCube` without touching the order rows.  A
+filter's daily series is the sum of the selected rows.  :func:`rolling_trend`
+then resamples that series to weeks, months or quarters and adds any number
+of rolling means, all by differencing cumulative sums, so switching
+granularity or window never regroups the orders.
+"""
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+GRANULARITIES = {"D": "Daily", "W": "Weekly", "M": "Monthly", "Q": "Quarterly"}
+UNITS = {"D": "Day", "W": "Week", "M": "Month", "Q": "Quarter"}
+# Rolling windows offered per granularity, in periods of that granularity
+WINDOWS = {"D": (7, 30, 90), "W": (4, 13), "M": (3, 12), "Q": (4,)}
+
+
+# -----------------------------
+# RESAMPLING AND ROLLING MEANS
+# -----------------------------
+def fill_days(daily, start=None, end=None):
+    """``daily`` reindexed to every day from ``start`` (or its first day) to ``end``, zero-filled."""
+    first = pd.Timestamp(start) if start is not None else (daily.index.min() if len(daily) else None)
+    last = pd.Timestamp(end) if end is not None else (daily.index.max() if len(daily) else None)
+    if first is None or last is None:
+        return daily.iloc[:0]
+    days = pd.date_range(first.normalize(), last.normalize(), freq="D", name=daily.index.name or "Date")
+    return daily.groupby(pd.DatetimeIndex(daily.index).normalize()).sum().reindex(days, fill_value=0.0)
+
+
+def _period_bounds(days, freq):
+    """Start position of each ``freq`` period in consecutive ``days``, followed by ``len(days)``."""
+    if freq == "D":
+        return np.arange(len(days) + 1)
+    codes = days.to_period(freq).asi8
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.empty(0, np.int64)
+    return np.r_[starts, len(days)]
+
+
+def rolling_trend(daily, freq="D", windows=()):
+    """Resample a gap-filled daily series to ``freq`` and add rolling means.
+
+    Returns a frame indexed by period start (``Date``) with the sum of each
+    period and a ``Rolling_<w>`` column per window: the mean of the last
+    ``w`` periods, or of all periods so far near the start.  A partial first
+    period is labelled with the series' first day, never a date before it.
+    """
+    if freq not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity {freq!r}; expected one of {list(GRANULARITIES)}")
+    days = pd.DatetimeIndex(daily.index)
+    values = daily.to_numpy(dtype=np.float64)
+    bounds = _period_bounds(days, freq)
+    cum = np.concatenate([[0.0], np.cumsum(values)])
+    totals = cum[bounds[1:]] - cum[bounds[:-1]]
+    labels = days[bounds[:-1]]
+    if freq != "D":
+        labels = labels.to_period(freq).start_time
+        labels = labels.where(labels >= days[0], days[0]) if len(labels) else labels
+    out = pd.DataFrame({daily.name or "TotalPrice": totals}, index=pd.DatetimeIndex(labels, name="Date"))
+
+    cum = np.concatenate([[0.0], np.cumsum(totals)])
+    end = np.arange(1, len(totals) + 1)
+    for w in windows:
+        start = np.maximum(end - int(w), 0)
+        out[f"Rolling_{w}"] = (cum[end] - cum[start]) / (end - start)
+    return out
+
+
+# -----------------------------
+# DENSE DAILY SERIES
+# -----------------------------
+def _positions(labels, axis):
+    if labels is None:
+        return np.arange(len(axis))
+    pos = pd.Index(axis).get_indexer(list(labels))
+    return np.unique(pos[pos >= 0])
+
+
+class DailySeries:
+    """Gap-filled daily sums per (Region, Product), ``values[measure][region, product, day]``."""
+
+    def __init__(self, days, regions, products, values):
+        self.days = days
+        self.regions = regions
+        self.products = products
+        self.values = values
+
+    @classmethod
+    def from_cube(cls, cube):
+        dates = pd.DatetimeIndex(cube.dates).normalize()
+        if len(dates):
+            days = pd.date_range(dates[0], dates[-1], freq="D", name="Date")
+        else:
+            days = pd.DatetimeIndex([], name="Date")
+        pos = days.get_indexer(dates)
+        values = {}
+        for measure, sums in cube.sums.items():
+            dense = np.zeros((len(cube.regions), len(cube.products), len(days)))
+            np.add.at(dense, (slice(None), slice(None), pos), sums.transpose(1, 2, 0))
+            values[measure] = dense
+        return cls(days, cube.regions, cube.products, values)
+
+    def daily(self, measure="TotalPrice", regions=None, products=None, start=None, end=None):
+        """Daily sums of ``measure`` over the selected series; date bounds are inclusive."""
+        lo = 0 if start is None else int(self.days.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.days) if end is None else int(self.days.searchsorted(pd.Timestamp(end), side="right"))
+        selected = self.values[measure][:, :, lo:hi][np.ix_(_positions(regions, self.regions),
+                                                              _positions(products, self.products))]
+        return pd.Series(selected.sum(axis=(0, 1)), index=self.days[lo:hi], name=measure)
+
+    def trend(self, measure="TotalPrice", regions=None, products=None, start=None, end=None, freq="D", windows=()):
+        # Zero-fill out to the requested bounds, as DataSource.trend does
+        daily = self.daily(measure, regions, products, start, end)
+        return rolling_trend(fill_days(daily, start, end), freq, windows)
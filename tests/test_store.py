@@ -0,0 +1,41 @@
+import pytest
+
+from salesdash.bench.synthetic import synthetic_chunk
+from salesdash.store import SalesStore
+
+
+def test_append_rejects_orders_already_stored(tmp_path):
+    store = SalesStore(tmp_path / "store")
+    batch = synthetic_chunk(200)
+    store.append(batch)
+    daily = store.daily()
+
+    with pytest.raises(ValueError, match="already in the store"):
+        store.append(batch)
+
+    assert store.version == 1
+    assert store.manifest()["rows"] == 200
+    assert len(store.load()) == 200
+    assert store.daily()["Orders"].sum() == daily["Orders"].sum() == 200
+
+
+def test_append_rejects_orders_stored_by_another_process(tmp_path):
+    SalesStore(tmp_path / "store").append(synthetic_chunk(100))
+    with pytest.raises(ValueError, match="already in the store"):
+        SalesStore(tmp_path / "store").append(synthetic_chunk(100))
+
+
+def test_append_rejects_orders_repeated_in_a_batch(tmp_path):
+    batch = synthetic_chunk(50)
+    batch.loc[1, "OrderID"] = batch.loc[0, "OrderID"]
+    with pytest.raises(ValueError, match="repeats OrderIDs"):
+        SalesStore(tmp_path / "store").append(batch)
+
+
+def test_append_accepts_new_orders(tmp_path):
+    store = SalesStore(tmp_path / "store")
+    store.append(synthetic_chunk(100))
+    store.append(synthetic_chunk(100, offset=100))
+    assert store.version == 2
+    assert store.load()["OrderID"].nunique() == 200
+    assert store.daily()["Orders"].sum() == 200